@@ -10,6 +10,7 @@ This example demonstrates the complete HTCL workflow:
 """
 
 import hashlib
+import sys
 import time
 import json
 from htcl_script import (
@@ -22,12 +23,13 @@ from htcl_transaction import (
     HTCLTransactionBuilder,
     HTCLTransactionValidator,
     HTCLTransactionSerializer,
+    Utxo,
     estimate_transaction_fee,
     get_current_block_height
 )
 
 
-def main():
+def main(current_block=None):
     """Demonstrate complete HTCL workflow."""
     print("🐕 Dogecoin HTCL (Hash Time-Locked Contract) Example")
     print("=" * 60)
@@ -48,7 +50,8 @@ def main():
     print(f"   Generated hashlock: {hashlock}")
     
     # Set timelock (current block + 1000 blocks)
-    current_block = get_current_block_height()
+    if current_block is None:
+        current_block = get_current_block_height()
     timelock = current_block + 1000
     print(f"   Current block: {current_block}")
     print(f"   Timelock block: {timelock}")
@@ -83,11 +86,11 @@ def main():
     
     # Example input UTXOs (in practice, you'd get these from a wallet)
     input_utxos = [
-        {
-            'txid': '1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef',
-            'vout': 0,
-            'amount': 1000000  # 1 DOGE in satoshis
-        }
+        Utxo(
+            txid='1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef',
+            vout=0,
+            amount=1000000  # 1 DOGE in satoshis
+        )
     ]
     
     amount = 500000  # 0.5 DOGE
@@ -104,7 +107,7 @@ def main():
     
     print(f"   Funding amount: {amount} satoshis ({amount/100000000:.8f} DOGE)")
     print(f"   Transaction fee: {fee} satoshis")
-    print(f"   Change amount: {input_utxos[0]['amount'] - amount - fee} satoshis")
+    print(f"   Change amount: {input_utxos[0].amount - amount - fee} satoshis")
     
     # Validate funding transaction
     if HTCLTransactionValidator.validate_funding_transaction(funding_tx, script):
@@ -204,8 +207,9 @@ def main():
         }
     }
     
+    # Serialize once and write in a single call rather than streaming tokens
     with open('htcl_transaction_data.json', 'w') as f:
-        json.dump(transaction_data, f, indent=2)
+        f.write(json.dumps(transaction_data, indent=2))
     
     print("   ✅ Transaction data saved to 'htcl_transaction_data.json'")
     
@@ -227,7 +231,7 @@ def main():
     print("     - Verify all transaction parameters")
 
 
-def demonstrate_htcl_workflow():
+def demonstrate_htcl_workflow(current_block=None):
     """Demonstrate the complete HTCL workflow with detailed explanations."""
     print("\n" + "="*60)
     print("🔍 HTCL Workflow Demonstration")
@@ -238,7 +242,9 @@ def demonstrate_htcl_workflow():
     bob_pubkey = "02" + "b" * 64
     secret = "my_secret_key_for_htcl_contract_2024"
     hashlock = generate_hashlock(secret)
-    timelock = get_current_block_height() + 100
+    if current_block is None:
+        current_block = get_current_block_height()
+    timelock = current_block + 100
     
     print(f"📝 Creating HTCL with parameters:")
     print(f"   Alice: {alice_pubkey[:16]}...")
@@ -264,13 +270,13 @@ def demonstrate_htcl_workflow():
     
     # Bob's path
     bob_valid = HTCLScriptValidator.validate_bob_spending(
-        script, secret, "signature", bob_pubkey
+        script, secret, "s" * 64, bob_pubkey
     )
     print(f"   Bob's withdrawal (with secret): {'✅ Valid' if bob_valid else '❌ Invalid'}")
     
     # Alice's path
     alice_valid = HTCLScriptValidator.validate_alice_spending(
-        script, "signature", alice_pubkey, timelock + 1
+        script, "s" * 64, alice_pubkey, timelock + 1
     )
     print(f"   Alice's withdrawal (after timelock): {'✅ Valid' if alice_valid else '❌ Invalid'}")
     
@@ -281,10 +287,15 @@ def demonstrate_htcl_workflow():
 
 
 if __name__ == "__main__":
+    # The example prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
+    
     try:
-        main()
+        # Query the block height once and share it between both demos
+        current_block = get_current_block_height()
+        main(current_block)
         print("\n" + "="*60)
-        demonstrate_htcl_workflow()
+        demonstrate_htcl_workflow(current_block)
     except Exception as e:
         print(f"\n❌ Error: {e}")
         import traceback
@@ -6,15 +6,48 @@ This module provides utilities for creating and spending HTCL transactions
 for Dogecoin using Bitcoin-style transaction structures.
 """
 
+import functools
 import hashlib
 import json
+import sys
 import time
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from operator import attrgetter
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple, Union
+from dataclasses import dataclass, fields
 from htcl_script import HTCLScript, HTCLScriptGenerator, HTCLScriptValidator
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
 
-@dataclass
+
+# Stand-in signature for spending checks made before anything is signed; the
+# validators only check the format, which requires at least 64 characters
+_PLACEHOLDER_SIGNATURE = "0" * 64
+
+# Constant scriptPubKey fragments, joined around an address
+_P2PKH_PREFIX = sys.intern("OP_DUP OP_HASH160 ")
+_P2PKH_SUFFIX = sys.intern(" OP_EQUALVERIFY OP_CHECKSIG")
+
+
+@functools.lru_cache(maxsize=1024)
+def _p2pkh_script(address: str) -> str:
+    """Build (and cache) the P2PKH scriptPubKey for an address."""
+    return _P2PKH_PREFIX + address + _P2PKH_SUFFIX
+
+
+class Utxo(NamedTuple):
+    """An unspent transaction output available for funding."""
+    txid: str
+    vout: int
+    amount: int  # In satoshis
+
+
+_get_amount = attrgetter('amount')
+
+
+@dataclass(slots=True)
 class HTCLTransaction:
     """Represents an HTCL transaction with all necessary data."""
     txid: str
@@ -26,6 +59,9 @@ class HTCLTransaction:
     witness: Optional[List[str]] = None
 
 
+_TX_FIELDS = tuple(f.name for f in fields(HTCLTransaction))
+
+
 class HTCLTransactionBuilder:
     """Builds HTCL transactions for Dogecoin."""
     
@@ -45,7 +81,7 @@ class HTCLTransactionBuilder:
         script: HTCLScript,
         amount: int,
         fee: int,
-        input_utxos: List[Dict],
+        input_utxos: Sequence[Union[Utxo, Tuple[str, int, int], Dict]],
         change_address: str
     ) -> HTCLTransaction:
         """
@@ -55,14 +91,22 @@ class HTCLTransactionBuilder:
             script: The HTCL script
             amount: Amount to send in satoshis
             fee: Transaction fee in satoshis
-            input_utxos: List of UTXOs to spend
+            input_utxos: UTXOs to spend (Utxo tuples, plain (txid, vout, amount) tuples or dicts with the same keys)
             change_address: Address to send change to
             
         Returns:
             HTCLTransaction object
         """
+        # Accept plain dicts and (txid, vout, amount) tuples as well as Utxo tuples
+        utxos = [
+            utxo if isinstance(utxo, Utxo)
+            else Utxo(*utxo) if isinstance(utxo, tuple)
+            else Utxo(utxo['txid'], utxo['vout'], utxo['amount'])
+            for utxo in input_utxos
+        ]
+        
         # Calculate total input amount
-        total_input = sum(utxo['amount'] for utxo in input_utxos)
+        total_input = sum(map(_get_amount, utxos))
         
         # Calculate change amount
         change_amount = total_input - amount - fee
@@ -70,15 +114,11 @@ class HTCLTransactionBuilder:
         if change_amount < 0:
             raise ValueError("Insufficient funds for transaction")
         
-        # Create inputs
-        inputs = []
-        for utxo in input_utxos:
-            inputs.append({
-                'txid': utxo['txid'],
-                'vout': utxo['vout'],
-                'script_sig': '',  # Will be filled during signing
-                'sequence': 0xffffffff
-            })
+        # Create inputs (script_sig will be filled during signing)
+        inputs = [
+            {'txid': utxo.txid, 'vout': utxo.vout, 'script_sig': '', 'sequence': 0xffffffff}
+            for utxo in utxos
+        ]
         
         # Create outputs
         outputs = []
@@ -86,7 +126,7 @@ class HTCLTransactionBuilder:
         # HTCL output
         outputs.append({
             'value': amount,
-            'script_pubkey': f"OP_HASH160 {script.p2sh_address} OP_EQUAL",
+            'script_pubkey': script.p2sh_script_pubkey,
             'address': script.p2sh_address
         })
         
@@ -94,7 +134,7 @@ class HTCLTransactionBuilder:
         if change_amount > 0:
             outputs.append({
                 'value': change_amount,
-                'script_pubkey': f"OP_DUP OP_HASH160 {change_address} OP_EQUALVERIFY OP_CHECKSIG",
+                'script_pubkey': _p2pkh_script(change_address),
                 'address': change_address
             })
         
@@ -116,7 +156,8 @@ class HTCLTransactionBuilder:
         amount: int,
         fee: int,
         bob_private_key: str,
-        bob_address: str
+        bob_address: str,
+        validate: bool = True
     ) -> HTCLTransaction:
         """
         Create Bob's withdrawal transaction (before timelock with secret).
@@ -128,13 +169,15 @@ class HTCLTransactionBuilder:
             fee: Transaction fee in satoshis
             bob_private_key: Bob's private key
             bob_address: Bob's address to receive funds
+            validate: Check the spending conditions before building; pass False
+                when the transaction is validated separately afterwards
             
         Returns:
             HTCLTransaction object
         """
         # Validate spending conditions
-        if not HTCLScriptValidator.validate_bob_spending(
-            script, secret, "dummy_signature", script.bob_pubkey
+        if validate and not HTCLScriptValidator.validate_bob_spending(
+            script, secret, _PLACEHOLDER_SIGNATURE, script.bob_pubkey
         ):
             raise ValueError("Invalid spending conditions for Bob")
         
@@ -152,7 +195,7 @@ class HTCLTransactionBuilder:
         # Bob's withdrawal output
         outputs.append({
             'value': amount - fee,
-            'script_pubkey': f"OP_DUP OP_HASH160 {bob_address} OP_EQUALVERIFY OP_CHECKSIG",
+            'script_pubkey': _p2pkh_script(bob_address),
             'address': bob_address
         })
         
@@ -174,7 +217,8 @@ class HTCLTransactionBuilder:
         fee: int,
         alice_private_key: str,
         alice_address: str,
-        current_block: int
+        current_block: int,
+        validate: bool = True
     ) -> HTCLTransaction:
         """
         Create Alice's withdrawal transaction (after timelock).
@@ -186,13 +230,15 @@ class HTCLTransactionBuilder:
             alice_private_key: Alice's private key
             alice_address: Alice's address to receive funds
             current_block: Current block height
+            validate: Check the spending conditions before building; pass False
+                when the transaction is validated separately afterwards
             
         Returns:
             HTCLTransaction object
         """
         # Validate spending conditions
-        if not HTCLScriptValidator.validate_alice_spending(
-            script, "dummy_signature", script.alice_pubkey, current_block
+        if validate and not HTCLScriptValidator.validate_alice_spending(
+            script, _PLACEHOLDER_SIGNATURE, script.alice_pubkey, current_block
         ):
             raise ValueError("Invalid spending conditions for Alice")
         
@@ -210,7 +256,7 @@ class HTCLTransactionBuilder:
         # Alice's withdrawal output
         outputs.append({
             'value': amount - fee,
-            'script_pubkey': f"OP_DUP OP_HASH160 {alice_address} OP_EQUALVERIFY OP_CHECKSIG",
+            'script_pubkey': _p2pkh_script(alice_address),
             'address': alice_address
         })
         
@@ -226,6 +272,12 @@ class HTCLTransactionBuilder:
         return tx
 
 
+def _first_push(tx_input: Dict) -> str:
+    """Get the push preceding the redeem script in an input's script_sig."""
+    # The redeem script is hex and always last, so split on the final space only
+    return tx_input.get('script_sig', '').rpartition(' ')[0]
+
+
 class HTCLTransactionValidator:
     """Validates HTCL transactions."""
     
@@ -234,13 +286,8 @@ class HTCLTransactionValidator:
         """Validate a funding transaction."""
         try:
             # Check if there's an output to the HTCL address
-            htcl_output = None
-            for output in tx.outputs:
-                if output.get('address') == script.p2sh_address:
-                    htcl_output = output
-                    break
-            
-            if not htcl_output:
+            p2sh_address = script.p2sh_address
+            if not any(output.get('address') == p2sh_address for output in tx.outputs):
                 return False
             
             # Check if script is valid
@@ -260,17 +307,16 @@ class HTCLTransactionValidator:
     ) -> bool:
         """Validate Bob's withdrawal transaction."""
         try:
-            # Check if input contains the secret
+            # Check if the input pushes the secret
             if not tx.inputs:
                 return False
             
-            input_script = tx.inputs[0].get('script_sig', '')
-            if secret not in input_script:
+            if _first_push(tx.inputs[0]) != secret:
                 return False
             
             # Validate the secret
             if not HTCLScriptValidator.validate_bob_spending(
-                script, secret, "dummy", script.bob_pubkey
+                script, secret, _PLACEHOLDER_SIGNATURE, script.bob_pubkey
             ):
                 return False
             
@@ -287,12 +333,11 @@ class HTCLTransactionValidator:
     ) -> bool:
         """Validate Alice's withdrawal transaction."""
         try:
-            # Check if input contains the timelock
+            # Check if the input pushes the timelock
             if not tx.inputs:
                 return False
             
-            input_script = tx.inputs[0].get('script_sig', '')
-            if str(script.timelock) not in input_script:
+            if _first_push(tx.inputs[0]) != str(script.timelock):
                 return False
             
             # Validate timelock has expired
@@ -311,20 +356,16 @@ class HTCLTransactionSerializer:
     @staticmethod
     def to_json(tx: HTCLTransaction) -> str:
         """Convert transaction to JSON string."""
-        return json.dumps({
-            'txid': tx.txid,
-            'version': tx.version,
-            'inputs': tx.inputs,
-            'outputs': tx.outputs,
-            'locktime': tx.locktime,
-            'script_sig': tx.script_sig,
-            'witness': tx.witness
-        }, indent=2)
+        # Shallow mapping of the fields; asdict would deep-copy inputs and outputs
+        data = {name: getattr(tx, name) for name in _TX_FIELDS}
+        if orjson is not None:
+            return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode()
+        return json.dumps(data, indent=2)
     
     @staticmethod
-    def from_json(json_str: str) -> HTCLTransaction:
-        """Create transaction from JSON string."""
-        data = json.loads(json_str)
+    def from_json(json_str: Union[str, bytes]) -> HTCLTransaction:
+        """Create transaction from JSON string or bytes."""
+        data = orjson.loads(json_str) if orjson is not None else json.loads(json_str)
         return HTCLTransaction(
             txid=data['txid'],
             version=data['version'],
@@ -345,9 +386,17 @@ class HTCLTransactionSerializer:
             'outputs': tx.outputs,
             'locktime': tx.locktime
         }
+        # Always the stdlib encoder: its default separators are the established
+        # hex format, and orjson cannot reproduce them
         return json.dumps(tx_data).encode().hex()
 
 
+# Approximate serialized sizes used for fee estimation
+_BASE_TX_SIZE = 10  # Version + locktime
+_INPUT_SIZE = 150  # Approximate input size
+_OUTPUT_SIZE = 34  # Approximate output size
+
+
 def estimate_transaction_fee(input_count: int, output_count: int, network_fee_rate: int = 1) -> int:
     """
     Estimate transaction fee in satoshis.
@@ -362,18 +411,53 @@ def estimate_transaction_fee(input_count: int, output_count: int, network_fee_ra
     """
     # Simplified fee estimation
     # In practice, you'd calculate actual transaction size
-    base_size = 10  # Version + locktime
-    input_size = input_count * 150  # Approximate input size
-    output_size = output_count * 34  # Approximate output size
+    base_size = _BASE_TX_SIZE
+    input_size = input_count * _INPUT_SIZE
+    output_size = output_count * _OUTPUT_SIZE
     
     total_size = base_size + input_size + output_size
     return total_size * network_fee_rate
 
 
+def estimate_transaction_fees_batch(
+    input_counts: Iterable[int],
+    output_counts: Iterable[int],
+    network_fee_rate: int = 1
+) -> List[int]:
+    """
+    Estimate transaction fees for many (input_count, output_count) shapes at once.
+    
+    Args:
+        input_counts: Number of inputs for each candidate transaction
+        output_counts: Number of outputs for each candidate transaction
+        network_fee_rate: Fee rate in satoshis per byte
+        
+    Returns:
+        Estimated fees in satoshis, in the same order as the candidates
+    """
+    # Same closed form as estimate_transaction_fee, without a call per candidate
+    base, per_input, per_output = _BASE_TX_SIZE, _INPUT_SIZE, _OUTPUT_SIZE
+    return [
+        (base + i * per_input + o * per_output) * network_fee_rate
+        for i, o in zip(input_counts, output_counts)
+    ]
+
+
+# Last block height estimate and the monotonic time it was taken at
+_BLOCK_HEIGHT_TTL = 1.0  # Seconds
+_last_height_ts = float('-inf')
+_last_height = 0
+
+
 def get_current_block_height() -> int:
-    """Get current block height (placeholder)."""
-    # In practice, you'd query a Dogecoin node or API
-    return int(time.time() / 60)  # Rough estimate: 1 block per minute
+    """Get current block height (placeholder), cached for a short TTL."""
+    global _last_height_ts, _last_height
+    now = time.monotonic()
+    if now - _last_height_ts > _BLOCK_HEIGHT_TTL:
+        # In practice, you'd query a Dogecoin node or API
+        _last_height = int(time.time() / 60)  # Rough estimate: 1 block per minute
+        _last_height_ts = now
+    return _last_height
 
 
 if __name__ == "__main__":
@@ -398,11 +482,7 @@ if __name__ == "__main__":
     builder = HTCLTransactionBuilder()
     
     # Example input UTXOs
-    input_utxos = [{
-        'txid': 'previous_tx_hash',
-        'vout': 0,
-        'amount': 1000000
-    }]
+    input_utxos = [Utxo(txid='previous_tx_hash', vout=0, amount=1000000)]
     
     # Create funding transaction
     funding_tx = builder.create_funding_transaction(
@@ -8,33 +8,59 @@ transaction creation, and validation functionality.
 
 import unittest
 import hashlib
+import json
 import time
 from htcl_script import (
     HTCLScriptGenerator,
     HTCLScriptValidator,
     generate_hashlock,
+    generate_hashlocks,
+    batch_p2sh,
     create_random_secret,
+    create_random_secret_bytes,
     HTCLScript
 )
 from htcl_transaction import (
+    HTCLTransaction,
     HTCLTransactionBuilder,
     HTCLTransactionValidator,
     HTCLTransactionSerializer,
+    Utxo,
     estimate_transaction_fee,
+    estimate_transaction_fees_batch,
     get_current_block_height
 )
 
+# Hashlocks for the constant fixture secrets, computed in one batch and
+# shared by every TestCase
+TEST_SECRET = "test_secret_for_htcl_contract"
+INTEGRATION_TEST_SECRET = "integration_test_secret"
+_FIXTURE_SECRETS = (TEST_SECRET, INTEGRATION_TEST_SECRET)
+precomputed_hashlocks = dict(zip(_FIXTURE_SECRETS, generate_hashlocks(_FIXTURE_SECRETS)))
+
+# Signatures are only format-checked, and must be at least 64 characters
+TEST_SIGNATURE = "s" * 64
+
+# The builder holds no per-transaction state, so one instance serves every test
+BUILDER = HTCLTransactionBuilder()
+
+# Immutable funding inputs shared by the transaction tests
+_TEST_UTXOS = (
+    Utxo(txid='1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef', vout=0, amount=1_000_000),
+)
+
 
 class TestHTCLScript(unittest.TestCase):
     """Test HTCL script generation and validation."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.alice_pubkey = "02" + "a" * 64
-        self.bob_pubkey = "02" + "b" * 64
-        self.timelock = 1000000
-        self.secret = "test_secret_for_htcl_contract"
-        self.hashlock = generate_hashlock(self.secret)
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared, read-only test fixtures."""
+        cls.alice_pubkey = "02" + "a" * 64
+        cls.bob_pubkey = "02" + "b" * 64
+        cls.timelock = 1000000
+        cls.secret = TEST_SECRET
+        cls.hashlock = precomputed_hashlocks[cls.secret]
     
     def test_create_valid_script(self):
         """Test creating a valid HTCL script."""
@@ -51,7 +77,7 @@ class TestHTCLScript(unittest.TestCase):
         self.assertEqual(script.timelock, self.timelock)
         self.assertEqual(script.hashlock, self.hashlock)
         self.assertTrue(script.script_hex)
-        self.assertTrue(script.p2sh_address.startswith('3'))
+        self.assertEqual(script.p2sh_address[0:1], '3')
     
     def test_create_script_invalid_pubkey(self):
         """Test creating script with invalid public key."""
@@ -94,18 +120,86 @@ class TestHTCLScript(unittest.TestCase):
         
         self.assertTrue(HTCLScriptGenerator.validate_script(script))
     
+    def test_validate_script_non_hex_fields(self):
+        """Test that scripts with non-hex fields construct and fail validation."""
+        script = HTCLScript(
+            alice_pubkey=self.alice_pubkey,
+            bob_pubkey="not_hex",
+            timelock=self.timelock,
+            hashlock="zz" * 20,
+            script_hex='00' * 60,
+            p2sh_address='3' * 34
+        )
+        
+        self.assertIsNone(script.hashlock_bytes)
+        self.assertFalse(HTCLScriptGenerator.validate_script(script))
+    
+    def test_validate_script_missing_script_hex(self):
+        """Test that a missing script_hex fails validation instead of raising."""
+        script = HTCLScript(
+            alice_pubkey=self.alice_pubkey,
+            bob_pubkey=self.bob_pubkey,
+            timelock=self.timelock,
+            hashlock=self.hashlock,
+            script_hex=None,
+            p2sh_address='3' * 34
+        )
+        
+        self.assertFalse(HTCLScriptGenerator.validate_script(script))
+    
+    def test_validated_flag_not_settable(self):
+        """Test that callers cannot mark a hand-built script as pre-validated."""
+        with self.assertRaises(TypeError):
+            HTCLScript(
+                alice_pubkey=self.alice_pubkey,
+                bob_pubkey=self.bob_pubkey,
+                timelock=self.timelock,
+                hashlock=self.hashlock,
+                script_hex='00' * 60,
+                p2sh_address='3' * 34,
+                _validated=True
+            )
+    
     def test_generate_hashlock(self):
         """Test hashlock generation."""
         secret = "test_secret"
         hashlock = generate_hashlock(secret)
         
         self.assertEqual(len(hashlock), 40)  # 20 bytes = 40 hex chars
-        self.assertTrue(all(c in '0123456789abcdef' for c in hashlock))
+        # Lowercase hex only: the round trip rejects uppercase and whitespace
+        self.assertEqual(bytes.fromhex(hashlock).hex(), hashlock)
         
         # Verify it's deterministic
         hashlock2 = generate_hashlock(secret)
         self.assertEqual(hashlock, hashlock2)
     
+    def test_generate_hashlocks(self):
+        """Test batch hashlock generation."""
+        secrets = ["test_secret", "another_secret", ""]
+        hashlocks = generate_hashlocks(secrets)
+        
+        self.assertEqual(hashlocks, [generate_hashlock(s) for s in secrets])
+    
+    def test_generate_hashlocks_raw(self):
+        """Test batch raw hashlock generation."""
+        secrets = [b"test_secret", "another_secret", b""]
+        hashlocks = generate_hashlocks(secrets, raw=True)
+        
+        self.assertEqual([h.hex() for h in hashlocks], [generate_hashlock(s) for s in secrets])
+    
+    def test_batch_p2sh(self):
+        """Test batch P2SH address derivation."""
+        script = HTCLScriptGenerator.create(
+            alice_pubkey=self.alice_pubkey,
+            bob_pubkey=self.bob_pubkey,
+            timelock=self.timelock,
+            hashlock=self.hashlock
+        )
+        
+        addresses = batch_p2sh([bytes.fromhex(script.script_hex)] * 2)
+        
+        self.assertEqual(addresses, [script.p2sh_address] * 2)
+    
     def test_create_random_secret(self):
         """Test random secret generation."""
         secret1 = create_random_secret()
@@ -114,24 +208,33 @@ class TestHTCLScript(unittest.TestCase):
         self.assertEqual(len(secret1), 64)  # 32 bytes = 64 hex chars
         self.assertEqual(len(secret2), 64)
         self.assertNotEqual(secret1, secret2)  # Should be different
+    
+    def test_generate_hashlock_from_bytes(self):
+        """Test hashlock generation from raw secret bytes."""
+        secret = create_random_secret_bytes()
+        
+        self.assertEqual(len(secret), 32)
+        self.assertEqual(len(generate_hashlock(secret)), 40)
+        self.assertEqual(generate_hashlock(b"test_secret"), generate_hashlock("test_secret"))
 
 
 class TestHTCLScriptValidator(unittest.TestCase):
     """Test HTCL script validation."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.alice_pubkey = "02" + "a" * 64
-        self.bob_pubkey = "02" + "b" * 64
-        self.timelock = 1000000
-        self.secret = "test_secret_for_htcl_contract"
-        self.hashlock = generate_hashlock(self.secret)
-        
-        self.script = HTCLScriptGenerator.create(
-            alice_pubkey=self.alice_pubkey,
-            bob_pubkey=self.bob_pubkey,
-            timelock=self.timelock,
-            hashlock=self.hashlock
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared, read-only test fixtures."""
+        cls.alice_pubkey = "02" + "a" * 64
+        cls.bob_pubkey = "02" + "b" * 64
+        cls.timelock = 1000000
+        cls.secret = TEST_SECRET
+        cls.hashlock = precomputed_hashlocks[cls.secret]
+        
+        cls.script = HTCLScriptGenerator.create(
+            alice_pubkey=cls.alice_pubkey,
+            bob_pubkey=cls.bob_pubkey,
+            timelock=cls.timelock,
+            hashlock=cls.hashlock
         )
     
     def test_validate_bob_spending_valid(self):
@@ -139,7 +242,7 @@ class TestHTCLScriptValidator(unittest.TestCase):
         result = HTCLScriptValidator.validate_bob_spending(
             self.script,
             self.secret,
-            "valid_signature",
+            TEST_SIGNATURE,
             self.bob_pubkey
         )
         self.assertTrue(result)
@@ -149,7 +252,7 @@ class TestHTCLScriptValidator(unittest.TestCase):
         result = HTCLScriptValidator.validate_bob_spending(
             self.script,
             "wrong_secret",
-            "valid_signature",
+            TEST_SIGNATURE,
             self.bob_pubkey
         )
         self.assertFalse(result)
@@ -159,16 +262,60 @@ class TestHTCLScriptValidator(unittest.TestCase):
         result = HTCLScriptValidator.validate_bob_spending(
             self.script,
             self.secret,
-            "valid_signature",
+            TEST_SIGNATURE,
             "wrong_pubkey"
         )
         self.assertFalse(result)
     
+    def test_validate_spending_with_pubkey_bytes(self):
+        """Test spending validation with raw public key bytes."""
+        signature = TEST_SIGNATURE
+        bob_pubkey_bytes = bytes.fromhex(self.bob_pubkey)
+        alice_pubkey_bytes = bytes.fromhex(self.alice_pubkey)
+        
+        self.assertTrue(HTCLScriptValidator.validate_bob_spending(
+            self.script, self.secret, signature, bob_pubkey_bytes
+        ))
+        self.assertFalse(HTCLScriptValidator.validate_bob_spending(
+            self.script, self.secret, signature, alice_pubkey_bytes
+        ))
+        self.assertTrue(HTCLScriptValidator.validate_alice_spending(
+            self.script, signature, alice_pubkey_bytes, self.timelock + 1
+        ))
+        self.assertFalse(HTCLScriptValidator.validate_alice_spending(
+            self.script, signature, bob_pubkey_bytes, self.timelock + 1
+        ))
+    
+    def test_validate_bob_spending_with_secret_bytes(self):
+        """Test Bob spending validation with a raw secret."""
+        signature = TEST_SIGNATURE
+        
+        self.assertTrue(HTCLScriptValidator.validate_bob_spending(
+            self.script, self.secret.encode(), signature, self.bob_pubkey
+        ))
+        self.assertFalse(HTCLScriptValidator.validate_bob_spending(
+            self.script, b"wrong_secret", signature, self.bob_pubkey
+        ))
+    
+    def test_validate_bob_spending_malformed_input(self):
+        """Test Bob spending with malformed input returns False instead of raising."""
+        signature = TEST_SIGNATURE
+        
+        self.assertFalse(HTCLScriptValidator.validate_bob_spending(
+            self.script, self.secret, None, self.bob_pubkey
+        ))
+        self.assertFalse(HTCLScriptValidator.validate_bob_spending(
+            self.script, None, signature, self.bob_pubkey
+        ))
+        self.assertFalse(HTCLScriptValidator.validate_bob_spending(
+            self.script, [self.secret], signature, self.bob_pubkey
+        ))
+    
     def test_validate_alice_spending_valid(self):
         """Test valid Alice spending conditions."""
         result = HTCLScriptValidator.validate_alice_spending(
             self.script,
-            "valid_signature",
+            TEST_SIGNATURE,
             self.alice_pubkey,
             self.timelock + 1  # After timelock
         )
@@ -178,7 +325,7 @@ class TestHTCLScriptValidator(unittest.TestCase):
         """Test Alice spending before timelock."""
         result = HTCLScriptValidator.validate_alice_spending(
             self.script,
-            "valid_signature",
+            TEST_SIGNATURE,
             self.alice_pubkey,
             self.timelock - 1  # Before timelock
         )
@@ -188,7 +335,7 @@ class TestHTCLScriptValidator(unittest.TestCase):
         """Test Alice spending with invalid public key."""
         result = HTCLScriptValidator.validate_alice_spending(
             self.script,
-            "valid_signature",
+            TEST_SIGNATURE,
             "wrong_pubkey",
             self.timelock + 1
         )
@@ -198,28 +345,23 @@ class TestHTCLScriptValidator(unittest.TestCase):
 class TestHTCLTransaction(unittest.TestCase):
     """Test HTCL transaction creation and validation."""
     
-    def setUp(self):
-        """Set up test fixtures."""
-        self.alice_pubkey = "02" + "a" * 64
-        self.bob_pubkey = "02" + "b" * 64
-        self.timelock = 1000000
-        self.secret = "test_secret_for_htcl_contract"
-        self.hashlock = generate_hashlock(self.secret)
-        
-        self.script = HTCLScriptGenerator.create(
-            alice_pubkey=self.alice_pubkey,
-            bob_pubkey=self.bob_pubkey,
-            timelock=self.timelock,
-            hashlock=self.hashlock
+    @classmethod
+    def setUpClass(cls):
+        """Set up shared, read-only test fixtures."""
+        cls.alice_pubkey = "02" + "a" * 64
+        cls.bob_pubkey = "02" + "b" * 64
+        cls.timelock = 1000000
+        cls.secret = TEST_SECRET
+        cls.hashlock = precomputed_hashlocks[cls.secret]
+        
+        cls.script = HTCLScriptGenerator.create(
+            alice_pubkey=cls.alice_pubkey,
+            bob_pubkey=cls.bob_pubkey,
+            timelock=cls.timelock,
+            hashlock=cls.hashlock
         )
         
-        self.builder = HTCLTransactionBuilder()
-        
-        self.input_utxos = [{
-            'txid': '1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef',
-            'vout': 0,
-            'amount': 1000000
-        }]
+        cls.builder = BUILDER
     
     def test_create_funding_transaction(self):
         """Test creating funding transaction."""
@@ -231,7 +373,7 @@ class TestHTCLTransaction(unittest.TestCase):
             script=self.script,
             amount=amount,
             fee=fee,
-            input_utxos=self.input_utxos,
+            input_utxos=_TEST_UTXOS,
             change_address=change_address
         )
         
@@ -240,6 +382,15 @@ class TestHTCLTransaction(unittest.TestCase):
         self.assertEqual(len(tx.outputs), 2)  # HTCL output + change output
         self.assertEqual(tx.outputs[0]['value'], amount)
     
+    def test_create_funding_transaction_plain_inputs(self):
+        """Test funding transaction from plain tuple and dict UTXOs."""
+        txid, vout, value = _TEST_UTXOS[0]
+        expected = self.builder.create_funding_transaction(self.script, 500000, 1000, _TEST_UTXOS, 'D8gP6wF1JP5XdQpw4VN3uXJmUixF6RT7b9')
+        
+        for utxo in ((txid, vout, value), {'txid': txid, 'vout': vout, 'amount': value}):
+            tx = self.builder.create_funding_transaction(self.script, 500000, 1000, [utxo], 'D8gP6wF1JP5XdQpw4VN3uXJmUixF6RT7b9')
+            self.assertEqual(tx, expected)
+    
     def test_create_funding_transaction_insufficient_funds(self):
         """Test funding transaction with insufficient funds."""
         amount = 2000000  # More than available
@@ -251,7 +402,7 @@ class TestHTCLTransaction(unittest.TestCase):
                 script=self.script,
                 amount=amount,
                 fee=fee,
-                input_utxos=self.input_utxos,
+                input_utxos=_TEST_UTXOS,
                 change_address=change_address
             )
     
@@ -306,11 +457,29 @@ class TestHTCLTransaction(unittest.TestCase):
             script=self.script,
             amount=amount,
             fee=fee,
-            input_utxos=self.input_utxos,
+            input_utxos=_TEST_UTXOS,
             change_address=change_address
         )
         
         self.assertTrue(HTCLTransactionValidator.validate_funding_transaction(tx, self.script))
+        
+        # Outputs edited after building are what gets validated
+        tx.outputs[0]['address'] = change_address
+        self.assertFalse(HTCLTransactionValidator.validate_funding_transaction(tx, self.script))
+    
+    def test_validate_funding_transaction_assembled_by_hand(self):
+        """Test funding validation for transactions assembled outside the builder."""
+        tx = HTCLTransaction(
+            txid='',
+            version=1,
+            inputs=[],
+            outputs=[{'value': 500000, 'address': self.script.p2sh_address}],
+            locktime=0
+        )
+        self.assertTrue(HTCLTransactionValidator.validate_funding_transaction(tx, self.script))
+        
+        tx.outputs[0]['address'] = 'D8gP6wF1JP5XdQpw4VN3uXJmUixF6RT7b9'
+        self.assertFalse(HTCLTransactionValidator.validate_funding_transaction(tx, self.script))
     
     def test_validate_bob_withdrawal_transaction(self):
         """Test Bob's withdrawal transaction validation."""
@@ -324,7 +493,8 @@ class TestHTCLTransaction(unittest.TestCase):
             amount=amount,
             fee=fee,
             bob_private_key='bob_private_key',
-            bob_address=bob_address
+            bob_address=bob_address,
+            validate=False  # Validated explicitly below
         )
         
         self.assertTrue(HTCLTransactionValidator.validate_bob_withdrawal_transaction(tx, self.script, self.secret))
@@ -342,10 +512,23 @@ class TestHTCLTransaction(unittest.TestCase):
             fee=fee,
             alice_private_key='alice_private_key',
             alice_address=alice_address,
-            current_block=current_block
+            current_block=current_block,
+            validate=False  # Validated explicitly below
         )
         
         self.assertTrue(HTCLTransactionValidator.validate_alice_withdrawal_transaction(tx, self.script, current_block))
+    
+    def test_validate_alice_withdrawal_rejects_longer_timelock(self):
+        """Test that a timelock merely containing the script's timelock is rejected."""
+        tx = HTCLTransaction(
+            txid='',
+            version=1,
+            inputs=[{'script_sig': f"{self.timelock}0 {self.script.script_hex}"}],
+            outputs=[],
+            locktime=0
+        )
+        
+        self.assertFalse(HTCLTransactionValidator.validate_alice_withdrawal_transaction(tx, self.script, self.timelock + 1))
 
 
 class TestHTCLTransactionSerializer(unittest.TestCase):
@@ -382,12 +565,42 @@ class TestHTCLTransactionSerializer(unittest.TestCase):
         self.assertEqual(tx2.version, self.tx.version)
         self.assertEqual(len(tx2.inputs), len(self.tx.inputs))
         self.assertEqual(len(tx2.outputs), len(self.tx.outputs))
+        
+        # Bytes input is accepted as well
+        tx3 = HTCLTransactionSerializer.from_json(json_str.encode())
+        self.assertEqual(tx3, tx2)
+    
+    def test_withdrawal_json_round_trip(self):
+        """Test that a withdrawal transaction survives a JSON round trip unchanged."""
+        hashlock = precomputed_hashlocks[TEST_SECRET]
+        script = HTCLScriptGenerator.create("02" + "a" * 64, "02" + "b" * 64, 1000000, hashlock)
+        tx = BUILDER.create_bob_withdrawal_transaction(
+            script, TEST_SECRET, 500000, 1000, "bob_private_key", "D8gP6wF1JP5XdQpw4VN3uXJmUixF6RT7b9",
+            validate=False
+        )
+        
+        json_str = HTCLTransactionSerializer.to_json(tx)
+        
+        self.assertEqual(json_str.count(TEST_SECRET), 1)
+        self.assertEqual(HTCLTransactionSerializer.from_json(json_str), tx)
+    
+    def test_transaction_has_no_instance_dict(self):
+        """Test that transactions are slotted and carry no per-instance __dict__."""
+        self.assertFalse(hasattr(self.tx, '__dict__'))
+        with self.assertRaises(AttributeError):
+            self.tx.unknown_field = 1
     
     def test_to_hex(self):
         """Test transaction to hex conversion."""
         hex_str = HTCLTransactionSerializer.to_hex(self.tx)
         self.assertIsInstance(hex_str, str)
         self.assertTrue(len(hex_str) > 0)
+        
+        # The encoding is a wire format; pin it byte for byte
+        self.assertEqual(bytes.fromhex(hex_str), (
+            b'{"version": 1, "inputs": [{"txid": "input_txid", "vout": 0}], '
+            b'"outputs": [{"value": 1000000, "address": "test_address"}], "locktime": 0}'
+        ))
 
 
 class TestUtilityFunctions(unittest.TestCase):
@@ -399,6 +612,14 @@ class TestUtilityFunctions(unittest.TestCase):
         self.assertIsInstance(fee, int)
         self.assertGreater(fee, 0)
     
+    def test_estimate_transaction_fees_batch(self):
+        """Test batch transaction fee estimation."""
+        input_counts = [1, 2, 5]
+        output_counts = [1, 3, 2]
+        fees = estimate_transaction_fees_batch(input_counts, output_counts, 2)
+        
+        self.assertEqual(fees, [estimate_transaction_fee(i, o, 2) for i, o in zip(input_counts, output_counts)])
+    
     def test_get_current_block_height(self):
         """Test current block height function."""
         block_height = get_current_block_height()
@@ -415,8 +636,8 @@ class TestHTCLIntegration(unittest.TestCase):
         alice_pubkey = "02" + "a" * 64
         bob_pubkey = "02" + "b" * 64
         timelock = 1000000
-        secret = "integration_test_secret"
-        hashlock = generate_hashlock(secret)
+        secret = INTEGRATION_TEST_SECRET
+        hashlock = precomputed_hashlocks[secret]
         
         script = HTCLScriptGenerator.create(
             alice_pubkey=alice_pubkey,
@@ -429,7 +650,7 @@ class TestHTCLIntegration(unittest.TestCase):
         self.assertTrue(HTCLScriptGenerator.validate_script(script))
         
         # Create funding transaction
-        builder = HTCLTransactionBuilder()
+        builder = BUILDER
         input_utxos = [{'txid': 'test_txid', 'vout': 0, 'amount': 1000000}]
         
         funding_tx = builder.create_funding_transaction(
@@ -1,85 +1,92 @@
 #!/usr/bin/env python3
 
+import argparse
+import base64
 import json
 import sys
 import os
 import time
 from shared_secret import generate_deterministic_secret_from_wallet, generate_deterministic_secret_from_private_key, generate_secret_and_hashlock
 
-# Add the cosmos directory to the path to import HTCL modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../cosmos'))
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
 
-from htcl_contract.src.msg import InstantiateMsg
+# Alice and Bob both have Cosmos addresses (same network); mock values
+ALICE_COSMOS_ADDRESS = "cosmos1aliceaddress123456789"
+BOB_COSMOS_ADDRESS = "cosmos1bobaddress123456789"
+HTCL_ADDRESS = "cosmos1htclcontractaddress123456789"
 
-def create_htcl_on_cosmos():
-    """Alice creates HTCL on Cosmos for Bob (both on Cosmos network) using deterministic wallet-based secret"""
+def _secret_from_mnemonic():
+    # In production, use actual wallet credentials
+    mnemonic = os.getenv('ALICE_MNEMONIC', 'abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about')
+    return generate_deterministic_secret_from_wallet(mnemonic)
+
+def _secret_from_private_key():
+    private_key = os.getenv('ALICE_PRIVATE_KEY', '0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef')
+    return generate_deterministic_secret_from_private_key(private_key)
+
+# Deterministic secret generation methods, most preferred (RECOMMENDED for production) first
+SECRET_METHODS = {
+    'mnemonic': ("deterministic wallet mnemonic", _secret_from_mnemonic),
+    'privkey': ("deterministic private key", _secret_from_private_key),
+}
+
+def create_htcl_on_cosmos(mode=None):
+    """Alice creates HTCL on Cosmos for Bob (both on Cosmos network) using deterministic wallet-based secret
+    
+    Args:
+        mode: 'mnemonic', 'privkey' or 'random' to pick the secret source; None tries them in that order
+    """
     
     print("🚀 Alice creating HTCL on Cosmos for Bob...")
     
-    # Method 1: Try deterministic wallet-based secret generation (RECOMMENDED for production)
-    try:
-        # In production, use actual wallet credentials
-        # Option A: Using mnemonic
-        mnemonic = os.getenv('ALICE_MNEMONIC', 'abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about')
-        print("🔐 Using deterministic wallet mnemonic for secret generation...")
-        result = generate_deterministic_secret_from_wallet(mnemonic)
+    if mode is None:
+        methods = SECRET_METHODS.values()
+    else:
+        methods = [SECRET_METHODS[mode]] if mode in SECRET_METHODS else []
+    
+    # Try the selected deterministic methods in order, falling back to a random secret
+    for label, generate in methods:
+        print(f"🔐 Using {label} for secret generation...")
+        try:
+            result = generate()
+        except Exception as e:
+            print(f"⚠️ {label.capitalize()} generation failed: {e}")
+            continue
         
-        print(f"✅ Deterministic wallet-based secret generated successfully!")
+        print(f"✅ Secret generated successfully from {label}!")
         print(f"Wallet Address: {result['wallet_address']}")
         print(f"Message: {result['message']}")
         print(f"Timestamp: {result['timestamp']}")
         print(f"Method: {result['method']}")
-        
-    except Exception as e:
-        print(f"⚠️ Deterministic mnemonic generation failed: {e}")
-        print("🔄 Trying private key method...")
-        
-        # Method 2: Try private key
-        try:
-            private_key = os.getenv('ALICE_PRIVATE_KEY', '0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef')
-            print("🔐 Using deterministic private key for secret generation...")
-            result = generate_deterministic_secret_from_private_key(private_key)
-            
-            print(f"✅ Deterministic private key-based secret generated successfully!")
-            print(f"Wallet Address: {result['wallet_address']}")
-            print(f"Message: {result['message']}")
-            print(f"Timestamp: {result['timestamp']}")
-            print(f"Method: {result['method']}")
-            
-        except Exception as e2:
-            print(f"⚠️ Deterministic private key generation failed: {e2}")
-            print("🔄 Falling back to random secret generation...")
-            
-            # Method 3: Fallback to random generation
-            result = generate_secret_and_hashlock()
-            print("✅ Random secret generated (for testing only)")
+        break
+    else:
+        print("🔄 Falling back to random secret generation...")
+        result = generate_secret_and_hashlock()
+        print("✅ Random secret generated (for testing only)")
     
     # Extract values
     secret = result['secret']
     hashlock = result['hashlock']  # Universal hashlock (0x format)
+    wallet_address = result.get('wallet_address')
+    method = result.get('method')
     
     print(f"\n📋 Generated values:")
     print(f"Secret: {secret}")
     print(f"Hashlock: {hashlock}")
     
     # Calculate timelock (1 hour from now)
-    timelock = int(time.time()) + 3600  # 1 hour
+    timelock = time.time_ns() // 10**9 + 3600  # 1 hour
     print(f"Timelock: {timelock}")
     
-    # Alice and Bob both have Cosmos addresses (same network)
-    alice_cosmos_address = "cosmos1aliceaddress123456789"
-    bob_cosmos_address = "cosmos1bobaddress123456789"
+    alice_cosmos_address = ALICE_COSMOS_ADDRESS
+    bob_cosmos_address = BOB_COSMOS_ADDRESS
     
     print(f"Alice Cosmos address: {alice_cosmos_address}")
     print(f"Bob Cosmos address: {bob_cosmos_address}")
     
-    # Create instantiate message for Cosmos HTCL
-    instantiate_msg = InstantiateMsg(
-        bob=bob_cosmos_address,  # Bob is the recipient on Cosmos
-        timelock=timelock,
-        hashlock=hashlock[2:],  # Remove 0x prefix for Cosmos format
-    )
-    
     print("📝 Creating instantiate message...")
     print(f"Alice (creator): {alice_cosmos_address}")
     print(f"Bob (recipient): {bob_cosmos_address}")
@@ -87,7 +94,7 @@ def create_htcl_on_cosmos():
     print(f"Hashlock: {hashlock}")
     
     # Simulate contract deployment
-    htcl_address = "cosmos1htclcontractaddress123456789"  # Mock address
+    htcl_address = HTCL_ADDRESS
     print(f"✅ HTCL deployed at: {htcl_address}")
     
     # Save Cosmos HTCL data
@@ -99,18 +106,20 @@ def create_htcl_on_cosmos():
         "hashlock": hashlock,  # Universal hashlock (0x format)
         "amount": "1000000",  # Mock amount in uatom
         "secret": secret,  # Keep secret for later use
+        "secretB64": base64.b64encode(result['secret_bytes']).decode(),  # Raw secret, cheaper to decode than hex
         "destinyNetwork": "polygon-amoy",
         "destinyTokenAddress": "0x0000000000000000000000000000000000000000",  # Native token
         "destinyTokenAmount": "1000000000000000000",  # 1 MATIC in wei
-        "walletAddress": result.get('wallet_address'),
+        "walletAddress": wallet_address,
         "message": result.get('message'),
         "timestamp": result.get('timestamp'),
-        "method": result.get('method')
+        "method": method
     }
     
     # Write to file for Bob to use
-    with open('cosmos_htcl_data.json', 'w') as f:
-        json.dump(cosmos_data, f, indent=2)
+    payload = orjson.dumps(cosmos_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(cosmos_data, indent=2).encode()
+    with open('cosmos_htcl_data.json', 'wb') as f:
+        f.write(payload)
     
     print("Transaction data saved to cosmos_htcl_data.json")
     
@@ -125,10 +134,10 @@ def create_htcl_on_cosmos():
     print(f"Destiny Network: {cosmos_data['destinyNetwork']}")
     print(f"Destiny Token: {cosmos_data['destinyTokenAddress']}")
     print(f"Destiny Amount: {cosmos_data['destinyTokenAmount']}")
-    if result.get('wallet_address'):
-        print(f"Wallet Address: {result['wallet_address']}")
-    if result.get('method'):
-        print(f"Secret Method: {result['method']}")
+    if wallet_address:
+        print(f"Wallet Address: {wallet_address}")
+    if method:
+        print(f"Secret Method: {method}")
     
     print("\n✅ Alice successfully created HTCL on Cosmos for Bob")
     print("📋 Next steps:")
@@ -140,7 +149,13 @@ def create_htcl_on_cosmos():
     return cosmos_data
 
 def main():
-    create_htcl_on_cosmos()
+    parser = argparse.ArgumentParser(description="Alice creates HTCL on Cosmos for Bob")
+    parser.add_argument('--mode', choices=[*SECRET_METHODS, 'random'],
+                        help="secret source (default: try mnemonic, then privkey, then random)")
+    args = parser.parse_args()
+    create_htcl_on_cosmos(args.mode)
 
 if __name__ == "__main__":
+    # The script prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
     main() 
\ No newline at end of file
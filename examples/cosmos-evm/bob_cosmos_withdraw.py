@@ -1,15 +1,16 @@
 #!/usr/bin/env python3
 
+import base64
 import json
 import sys
 import os
 import hashlib
 import time
 
-# Add the cosmos directory to the path to import HTCL modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../cosmos'))
-
-from htcl_contract.src.msg import ExecuteMsg
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
 
 def bob_withdraw_on_cosmos():
     """Bob withdraws from Cosmos HTCL (source network) with the secret before timelock expires"""
@@ -18,8 +19,8 @@ def bob_withdraw_on_cosmos():
     
     # Load transaction data
     try:
-        with open('cosmos_htcl_data.json', 'r') as f:
-            cosmos_data = json.load(f)
+        with open('cosmos_htcl_data.json', 'rb') as f:
+            cosmos_data = (orjson or json).loads(f.read())
     except FileNotFoundError:
         print("❌ Error: cosmos_htcl_data.json not found")
         print("Please run Alice's Cosmos script first")
@@ -27,8 +28,8 @@ def bob_withdraw_on_cosmos():
     
     # Load EVM data to check if Alice has withdrawn
     try:
-        with open('evm_htcl_data.json', 'r') as f:
-            evm_data = json.load(f)
+        with open('evm_htcl_data.json', 'rb') as f:
+            evm_data = (orjson or json).loads(f.read())
     except FileNotFoundError:
         print("❌ Error: evm_htcl_data.json not found")
         print("Please run Bob's EVM script first")
@@ -53,21 +54,27 @@ def bob_withdraw_on_cosmos():
     print(f"Source Token: {source_token_address}")
     print(f"Source Amount: {source_token_amount}")
     
-    # Validate secret matches hashlock
-    print("\n🔍 Validating secret...")
-    secret_bytes = bytes.fromhex(secret[2:] if secret.startswith('0x') else secret)
-    calculated_hashlock = hashlib.sha256(secret_bytes).hexdigest()
-    
-    if calculated_hashlock != hashlock:
-        print("❌ Error: Secret does not match hashlock")
-        print(f"Expected: {hashlock}")
-        print(f"Calculated: {calculated_hashlock}")
-        return None
-    
-    print("✅ Secret validation successful")
+    # Check the secret against the hashlock before withdrawing; HTCL_VERIFY=0 skips
+    # it, since the contract checks it again on withdrawal
+    if os.environ.get('HTCL_VERIFY', '1') != '0':
+        print("\n🔍 Validating secret...")
+        secret_b64 = cosmos_data.get('secretB64')
+        if secret_b64:
+            secret_bytes = base64.b64decode(secret_b64)
+        else:
+            secret_bytes = bytes.fromhex(secret.removeprefix('0x'))
+        calculated_hashlock = hashlib.sha256(secret_bytes).digest()
+        
+        if calculated_hashlock != bytes.fromhex(hashlock.removeprefix('0x')):
+            print("❌ Error: Secret does not match hashlock")
+            print(f"Expected: {hashlock}")
+            print(f"Calculated: 0x{calculated_hashlock.hex()}")
+            return None
+        
+        print("✅ Secret validation successful")
     
     # Check if timelock has expired
-    current_time = int(time.time())
+    current_time = time.time_ns() // 10**9
     if current_time >= timelock:
         print("❌ Error: Timelock has expired")
         print(f"Current time: {current_time}")
@@ -144,8 +151,9 @@ def bob_withdraw_on_cosmos():
     cosmos_data['withdrawTxid'] = withdrawal_tx['txid']
     cosmos_data['withdrawTimestamp'] = current_time
     
-    with open('cosmos_htcl_data.json', 'w') as f:
-        json.dump(cosmos_data, f, indent=2)
+    payload = orjson.dumps(cosmos_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(cosmos_data, indent=2).encode()
+    with open('cosmos_htcl_data.json', 'wb') as f:
+        f.write(payload)
     
     print("\n💰 Bob successfully withdrew from Cosmos HTCL (source network)")
     print("📋 Transaction details:")
@@ -170,4 +178,6 @@ def main():
     bob_withdraw_on_cosmos()
 
 if __name__ == "__main__":
+    # The script prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
     main() 
\ No newline at end of file
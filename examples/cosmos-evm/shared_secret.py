@@ -1,100 +1,124 @@
 #!/usr/bin/env python3
 
+import functools
 import hashlib
-import secrets
-import binascii
+import hmac
+import os
 import json
 import time
-from eth_account import Account
-from eth_account.messages import encode_defunct
-import hdwallet
-from hdwallet import BIP44HDWallet
-from hdwallet.cryptocurrencies import EthereumMainnet
-from hdwallet.derivations import BIP44Derivation
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
-def generate_deterministic_secret_from_wallet(mnemonic: str, derivation_path: str = "m/44'/60'/0'/0/0") -> Dict[str, Any]:
+# hashlib.sha256 is OpenSSL's constructor; bind it once for the hashing call sites
+_sha256 = hashlib.sha256
+_hmac_digest = hmac.digest
+
+@functools.lru_cache(maxsize=32)
+def _derive(mnemonic: str, derivation_path: str) -> Tuple[str, str]:
     """
-    Generate a deterministic secret from wallet that works across all chains
+    Derive the wallet private key and address; cached because BIP44 seed derivation is expensive
     Args:
         mnemonic: Wallet mnemonic phrase
         derivation_path: HD wallet derivation path
-    Returns: Object containing secret and hashlock
+    Returns: Tuple of (private key, address)
     """
-    # Initialize HD wallet
+    # Imported here so callers that never derive keys skip loading hdwallet
+    from hdwallet import BIP44HDWallet
+    from hdwallet.cryptocurrencies import EthereumMainnet
+    
     hdwallet: BIP44HDWallet = BIP44HDWallet(cryptocurrency=EthereumMainnet)
     hdwallet.from_mnemonic(mnemonic)
     hdwallet.from_path(derivation_path)
-    
-    # Get private key and address
-    private_key = hdwallet.private_key()
-    address = hdwallet.address()
+    return hdwallet.private_key(), hdwallet.address()
+
+def _derive_wallet(mnemonic: str, derivation_path: str) -> Tuple[str, str]:
+    """Derive the wallet keys; with HTCL_NO_KEY_CACHE set, keys are derived uncached and never kept in memory"""
+    if os.environ.get('HTCL_NO_KEY_CACHE'):
+        return _derive.__wrapped__(mnemonic, derivation_path)
+    return _derive(mnemonic, derivation_path)
+
+# (hour bucket, message, message bytes) for the current hour, rebuilt when the hour rolls over
+_MSG_CACHE = (None, '', b'')
+
+def _hourly_message() -> Tuple[int, str, bytes]:
+    """Return the timestamp rounded to the hour and the secret message derived from it"""
+    global _MSG_CACHE
+    timestamp = time.time_ns() // 10**9 // 3600 * 3600  # Round to hour for consistency
+    if _MSG_CACHE[0] != timestamp:
+        message = f"HTCL_CROSS_CHAIN_SECRET_{timestamp}"
+        _MSG_CACHE = (timestamp, message, message.encode())
+    return _MSG_CACHE
+
+def generate_deterministic_secret_from_wallet(mnemonic: str, derivation_path: str = "m/44'/60'/0'/0/0") -> Dict[str, Any]:
+    """
+    Generate a deterministic secret from wallet that works across all chains
+    Args:
+        mnemonic: Wallet mnemonic phrase
+        derivation_path: HD wallet derivation path
+    Returns: Object containing secret and hashlock
+    """
+    # Get private key and address from the HD wallet
+    private_key, address = _derive_wallet(mnemonic, derivation_path)
     
     # Create a deterministic secret using private key + timestamp
     # This ensures the same wallet generates the same secret for the same timestamp
-    timestamp = int(time.time() / 3600) * 3600  # Round to hour for consistency
-    message = f"HTCL_CROSS_CHAIN_SECRET_{timestamp}"
+    timestamp, message, message_bytes = _hourly_message()
     
     # Use HMAC-SHA256 with private key as key and message as data
     # This creates a deterministic secret that's the same across all chains
-    secret_bytes = hmac.new(
-        private_key.encode(),
-        message.encode(),
-        hashlib.sha256
-    ).digest()
+    secret_bytes = _hmac_digest(private_key.encode(), message_bytes, 'sha256')
     
-    secret_hex = '0x' + secret_bytes.hex()
+    secret_hex = f'0x{secret_bytes.hex()}'
     
     # Create hashlock (sha256 hash of the secret)
-    hashlock = hashlib.sha256(secret_bytes).hexdigest()
-    hashlock_hex = '0x' + hashlock
+    hashlock_bytes = _sha256(secret_bytes).digest()
+    hashlock_hex = f'0x{hashlock_bytes.hex()}'
     
     return {
         'secret': secret_hex,
         'secret_bytes': secret_bytes,
-        ',0-0': hashlock_hex,  # Universal hashlock (0x format)
+        'hashlock': hashlock_hex,  # Universal hashlock (0x format)
+        'hashlock_bytes': hashlock_bytes,
         'wallet_address': address,
         'message': message,
         'timestamp': timestamp,
         'method': 'deterministic_hmac'
     }
 
-def generate_deterministic_secret_from_private_key(private_key: str) -> Dict[str, Any]:
+def generate_deterministic_secret_from_private_key(private_key: str, want_address: bool = True) -> Dict[str, Any]:
     """
     Generate a deterministic secret from private key that works across all chains
     Args:
         private_key: Wallet private key (with or without 0x prefix)
+        want_address: Derive the wallet address; when False 'wallet_address' is None
     Returns: Object containing secret and hashlock
     """
     # Clean private key
-    if private_key.startswith('0x'):
-        private_key = private_key[2:]
+    private_key = private_key.removeprefix('0x')
     
-    # Create account from private key
-    account = Account.from_key('0x' + private_key)
-    address = account.address
+    # Create account from private key; deriving the address is the costly part
+    if want_address:
+        from eth_account import Account
+        address = Account.from_key(f'0x{private_key}').address
+    else:
+        address = None
     
     # Create a deterministic secret using private key + timestamp
-    timestamp = int(time.time() / 3600) * 3600  # Round to hour for consistency
-    message = f"HTCL_CROSS_CHAIN_SECRET_{timestamp}"
+    timestamp, message, message_bytes = _hourly_message()
     
     # Use HMAC-SHA256 with private key as key and message as data
-    secret_bytes = hmac.new(
-        bytes.fromhex(private_key),
-        message.encode(),
-        hashlib.sha256
-    ).digest()
+    secret_bytes = _hmac_digest(bytes.fromhex(private_key), message_bytes, 'sha256')
     
-    secret_hex = '0x' + secret_bytes.hex()
+    secret_hex = f'0x{secret_bytes.hex()}'
     
     # Create hashlock (sha256 hash of the secret)
-    hashlock = hashlib.sha256(secret_bytes).hexdigest()
-    hashlock_hex = '0x' + hashlock
+    hashlock_bytes = _sha256(secret_bytes).digest()
+    hashlock_hex = f'0x{hashlock_bytes.hex()}'
     
     return {
         'secret': secret_hex,
         'secret_bytes': secret_bytes,
         'hashlock': hashlock_hex,  # Universal hashlock (0x format)
+        'hashlock_bytes': hashlock_bytes,
         'wallet_address': address,
         'message': message,
         'timestamp': timestamp,
@@ -109,35 +133,32 @@ def generate_secret_from_wallet(mnemonic: str, derivation_path: str = "m/44'/60'
         derivation_path: HD wallet derivation path
     Returns: Object containing secret and hashlock
     """
-    # Initialize HD wallet
-    hdwallet: BIP44HDWallet = BIP44HDWallet(cryptocurrency=EthereumMainnet)
-    hdwallet.from_mnemonic(mnemonic)
-    hdwallet.from_path(derivation_path)
-    
-    # Get private key and address
-    private_key = hdwallet.private_key()
-    address = hdwallet.address()
+    # Get private key and address from the HD wallet
+    private_key, address = _derive_wallet(mnemonic, derivation_path)
     
     # Create a message to sign (this will be our secret)
-    message = "HTCL_CROSS_CHAIN_SECRET_" + str(int(time.time()))
+    message = "HTCL_CROSS_CHAIN_SECRET_" + str(time.time_ns() // 10**9)
     
     # Sign the message with the wallet
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
     account = Account.from_key(private_key)
     message_hash = encode_defunct(text=message)
     signed_message = account.sign_message(message_hash)
     
     # Use the signature as our secret
     secret_bytes = signed_message.signature
-    secret_hex = '0x' + secret_bytes.hex()
+    secret_hex = f'0x{secret_bytes.hex()}'
     
     # Create hashlock (sha256 hash of the secret)
-    hashlock = hashlib.sha256(secret_bytes).hexdigest()
-    hashlock_hex = '0x' + hashlock
+    hashlock_bytes = _sha256(secret_bytes).digest()
+    hashlock_hex = f'0x{hashlock_bytes.hex()}'
     
     return {
         'secret': secret_hex,
         'secret_bytes': secret_bytes,
         'hashlock': hashlock_hex,  # Universal hashlock (0x format)
+        'hashlock_bytes': hashlock_bytes,
         'wallet_address': address,
         'message': message,
         'signature': signed_message.signature.hex(),
@@ -152,15 +173,16 @@ def generate_secret_from_private_key(private_key: str) -> Dict[str, Any]:
     Returns: Object containing secret and hashlock
     """
     # Clean private key
-    if private_key.startswith('0x'):
-        private_key = private_key[2:]
+    private_key = private_key.removeprefix('0x')
     
     # Create account from private key
-    account = Account.from_key('0x' + private_key)
+    from eth_account import Account
+    from eth_account.messages import encode_defunct
+    account = Account.from_key(f'0x{private_key}')
     address = account.address
     
     # Create a message to sign (this will be our secret)
-    message = "HTCL_CROSS_CHAIN_SECRET_" + str(int(time.time()))
+    message = "HTCL_CROSS_CHAIN_SECRET_" + str(time.time_ns() // 10**9)
     
     # Sign the message with the wallet
     message_hash = encode_defunct(text=message)
@@ -168,16 +190,17 @@ def generate_secret_from_private_key(private_key: str) -> Dict[str, Any]:
     
     # Use the signature as our secret
     secret_bytes = signed_message.signature
-    secret_hex = '0x' + secret_bytes.hex()
+    secret_hex = f'0x{secret_bytes.hex()}'
     
     # Create hashlock (sha256 hash of the secret)
-    hashlock = hashlib.sha256(secret_bytes).hexdigest()
-    hashlock_hex = '0x' + hashlock
+    hashlock_bytes = _sha256(secret_bytes).digest()
+    hashlock_hex = f'0x{hashlock_bytes.hex()}'
     
     return {
         'secret': secret_hex,
         'secret_bytes': secret_bytes,
         'hashlock': hashlock_hex,  # Universal hashlock (0x format)
+        'hashlock_bytes': hashlock_bytes,
         'wallet_address': address,
         'message': message,
         'signature': signed_message.signature.hex(),
@@ -191,37 +214,76 @@ def generate_secret_and_hashlock():
     Returns: Object containing secret and hashlock
     """
     # Generate a random 32-byte secret
-    secret_bytes = secrets.token_bytes(32)
-    secret_hex = '0x' + secret_bytes.hex()
+    secret_bytes = os.urandom(32)
+    secret_hex = f'0x{secret_bytes.hex()}'
     
-    # Create hashlock (sha256 hash of the secret)
-    hashlock = hashlib.sha256(secret_bytes).hexdigest()
-    hashlock_hex = '0x' + hashlock
+    # Create hashlock (sha256 hash of the secret), keeping the raw digest
+    hashlock_bytes = _sha256(secret_bytes).digest()
+    hashlock_hex = f'0x{hashlock_bytes.hex()}'
     
     return {
         'secret': secret_hex,
         'secret_bytes': secret_bytes,
         'hashlock': hashlock_hex,  # Universal hashlock (0x format)
+        'hashlock_bytes': hashlock_bytes,
         'method': 'random'
     }
 
+def generate_secrets_and_hashlocks(count: int) -> list:
+    """
+    Generate many random secrets and their hashlocks at once
+    (Fallback method for testing without wallet)
+    Args:
+        count: Number of secrets to generate
+    Returns: List of objects containing secret and hashlock
+    """
+    # Draw all the entropy in one call and slice it, rather than keeping a
+    # long-lived pool that could be duplicated across a fork
+    entropy = os.urandom(32 * count)
+    results = []
+    for offset in range(0, 32 * count, 32):
+        secret_bytes = entropy[offset:offset + 32]
+        hashlock_bytes = _sha256(secret_bytes).digest()
+        results.append({
+            'secret': f'0x{secret_bytes.hex()}',
+            'secret_bytes': secret_bytes,
+            'hashlock': f'0x{hashlock_bytes.hex()}',  # Universal hashlock (0x format)
+            'hashlock_bytes': hashlock_bytes,
+            'method': 'random'
+        })
+    return results
+
+def _as_bytes(value):
+    """Raw bytes are used as-is; hex strings have any 0x prefix removed and are decoded"""
+    if isinstance(value, (bytes, bytearray)):
+        return value
+    return bytes.fromhex(value.removeprefix('0x'))
+
 def validate_secret(secret, hashlock):
     """
     Validate if a secret matches a given hashlock
     Args:
-        secret: The secret to validate
-        hashlock: The hashlock to check against
+        secret: The secret to validate, as hex or raw bytes
+        hashlock: The hashlock to check against, as hex or raw bytes
     Returns: True if secret matches hashlock
     """
-    # Remove 0x prefix if present
-    clean_secret = secret[2:] if secret.startswith('0x') else secret
-    secret_bytes = binascii.unhexlify(clean_secret)
-    
-    # Create hashlock from secret
-    calculated_hashlock = hashlib.sha256(secret_bytes).hexdigest()
-    expected_hashlock = hashlock[2:] if hashlock.startswith('0x') else hashlock
-    
-    return calculated_hashlock == expected_hashlock
+    # Compare raw digests rather than hex strings
+    return _sha256(_as_bytes(secret)).digest() == _as_bytes(hashlock)
+
+def validate_secrets(secrets, hashlocks):
+    """
+    Validate many secrets against their hashlocks at once
+    Args:
+        secrets: The secrets to validate, as hex or raw bytes
+        hashlocks: The hashlocks to check against, in the same order, as hex or raw bytes
+    Returns: List with True for each secret that matches its hashlock
+    """
+    # Keep the hash constructor and decoder in locals so the loop avoids global lookups
+    sha256, as_bytes = _sha256, _as_bytes
+    return [
+        sha256(as_bytes(secret)).digest() == as_bytes(hashlock)
+        for secret, hashlock in zip(secrets, hashlocks)
+    ]
 
 def cosmos_to_evm_hashlock(cosmos_hashlock):
     """
@@ -230,7 +292,7 @@ def cosmos_to_evm_hashlock(cosmos_hashlock):
         cosmos_hashlock: Hashlock in Cosmos format (hex string)
     Returns: Hashlock in EVM format (0x...)
     """
-    return cosmos_hashlock if cosmos_hashlock.startswith('0x') else '0x' + cosmos_hashlock
+    return f'0x{cosmos_hashlock.removeprefix("0x")}'
 
 def evm_to_cosmos_hashlock(evm_hashlock):
     """
@@ -239,11 +301,9 @@ def evm_to_cosmos_hashlock(evm_hashlock):
         evm_hashlock: Hashlock in EVM format (0x...)
     Returns: Hashlock in Cosmos format (hex string without 0x)
     """
-    return evm_hashlock[2:] if evm_hashlock.startswith('0x') else evm_hashlock
+    return evm_hashlock.removeprefix('0x')
 
 if __name__ == "__main__":
-    import hmac
-    
     print("=== Cross-Chain Compatible Secret Generation ===")
     
     # Example 1: Using deterministic HMAC (RECOMMENDED for production)
@@ -252,6 +312,7 @@ if __name__ == "__main__":
         # Example mnemonic (in production, use actual wallet mnemonic)
         mnemonic = "abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about"
         result = generate_deterministic_secret_from_wallet(mnemonic)
+        assert 'hashlock' in result
         
         print("Generated values:")
         print("Wallet Address:", result['wallet_address'])
@@ -262,7 +323,7 @@ if __name__ == "__main__":
         print("Hashlock:", result['hashlock'])
         
         print("\nValidation test:")
-        is_valid = validate_secret(result['secret'], result['hashlock'])
+        is_valid = validate_secret(result['secret_bytes'], result['hashlock'])
         print("Secret validation:", is_valid)
         
         # Test cross-chain compatibility
@@ -288,7 +349,7 @@ if __name__ == "__main__":
         print("Hashlock:", result['hashlock'])
         
         print("\nValidation test:")
-        is_valid = validate_secret(result['secret'], result['hashlock'])
+        is_valid = validate_secret(result['secret_bytes'], result['hashlock'])
         print("Secret validation:", is_valid)
         
     except Exception as e:
@@ -303,7 +364,7 @@ if __name__ == "__main__":
     print("Hashlock:", result['hashlock'])
     
     print("\nValidation test:")
-    is_valid = validate_secret(result['secret'], result['hashlock'])
+    is_valid = validate_secret(result['secret_bytes'], result['hashlock'])
     print("Secret validation:", is_valid)
     
     print("\nFormat conversion:")
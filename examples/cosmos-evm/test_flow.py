@@ -11,6 +11,11 @@ import sys
 import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
+
 # Add the shared_secret module to path
 sys.path.append(str(Path(__file__).parent))
 from shared_secret import generate_deterministic_secret_from_wallet
@@ -54,7 +59,7 @@ def test_cosmos_evm_flow():
         
         # 2. Alice creates HTCL on Cosmos (mocked)
         print("\n💸 Alice creating HTCL on Cosmos (mocked)...")
-        timelock = int(time.time()) + 3600  # 1 hour from now
+        timelock = time.time_ns() // 10**9 + 3600  # 1 hour from now
         
         cosmos_data = {
             "contractAddress": "cosmos1htclcontract123456789",
@@ -115,8 +120,9 @@ def test_cosmos_evm_flow():
         }
         
         data_path = Path(__file__).parent / "transaction_data.json"
-        with open(data_path, 'w') as f:
-            json.dump(transaction_data, f, indent=2)
+        payload = orjson.dumps(transaction_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(transaction_data, indent=2).encode()
+        with open(data_path, 'wb') as f:
+            f.write(payload)
         
         print(f"💾 Transaction data saved to: {data_path}")
         
@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
 
+import argparse
 import os
 import json
+import sys
 from shared_secret import generate_deterministic_secret_from_wallet, generate_deterministic_secret_from_private_key, generate_secret_and_hashlock
 from htcl_script import HTCLScriptGenerator
 
-def create_htcl_on_dogecoin():
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
+
+def create_htcl_on_dogecoin(mode='deterministic'):
     """
     Alice creates HTCL on Dogecoin for Bob
     This simulates the first step of the cross-chain HTCL flow
+    Args:
+        mode: 'deterministic' (wallet, then private key, then random) or 'random'
     """
     print("🔐 Alice creating HTCL on Dogecoin...")
     
@@ -19,21 +28,25 @@ def create_htcl_on_dogecoin():
     
     # Generate deterministic secret and hashlock
     print("🔑 Generating deterministic secret and hashlock...")
-    try:
-        # Method 1: Try deterministic wallet-based generation
-        mnemonic = os.getenv('ALICE_MNEMONIC', 'abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about')
-        result = generate_deterministic_secret_from_wallet(mnemonic)
-        print(f"✅ Using deterministic wallet-based generation")
-    except Exception as e:
+    if mode == 'random':
+        result = generate_secret_and_hashlock()
+        print(f"⚠️ Using random generation")
+    else:
         try:
-            # Method 2: Try deterministic private key-based generation
-            private_key = os.getenv('ALICE_PRIVATE_KEY', '0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef')
-            result = generate_deterministic_secret_from_private_key(private_key)
-            print(f"✅ Using deterministic private key-based generation")
-        except Exception as e2:
-            # Method 3: Fallback to random generation
-            result = generate_secret_and_hashlock()
-            print(f"⚠️ Using fallback random generation")
+            # Method 1: Try deterministic wallet-based generation
+            mnemonic = os.getenv('ALICE_MNEMONIC', 'abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon abandon about')
+            result = generate_deterministic_secret_from_wallet(mnemonic)
+            print(f"✅ Using deterministic wallet-based generation")
+        except Exception as e:
+            try:
+                # Method 2: Try deterministic private key-based generation
+                private_key = os.getenv('ALICE_PRIVATE_KEY', '0x1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef')
+                result = generate_deterministic_secret_from_private_key(private_key)
+                print(f"✅ Using deterministic private key-based generation")
+            except Exception as e2:
+                # Method 3: Fallback to random generation
+                result = generate_secret_and_hashlock()
+                print(f"⚠️ Using fallback random generation")
     
     secret = result['secret']
     hashlock = result['hashlock']  # Universal hashlock (0x format)
@@ -80,8 +93,9 @@ def create_htcl_on_dogecoin():
     }
     
     # Save to file
-    with open('dogecoin_htcl_data.json', 'w') as f:
-        json.dump(dogecoin_data, f, indent=2)
+    payload = orjson.dumps(dogecoin_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(dogecoin_data, indent=2).encode()
+    with open('dogecoin_htcl_data.json', 'wb') as f:
+        f.write(payload)
     
     print(f"💾 Dogecoin HTCL data saved to dogecoin_htcl_data.json")
     print(f"🎯 HTCL created on Dogecoin for Bob")
@@ -92,4 +106,10 @@ def create_htcl_on_dogecoin():
     return dogecoin_data
 
 if __name__ == "__main__":
-    create_htcl_on_dogecoin() 
\ No newline at end of file
+    # The script prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
+    
+    parser = argparse.ArgumentParser(description="Alice creates HTCL on Dogecoin for Bob")
+    parser.add_argument('--mode', choices=['deterministic', 'random'], default='deterministic',
+                        help="secret source (default: deterministic)")
+    create_htcl_on_dogecoin(parser.parse_args().mode) 
\ No newline at end of file
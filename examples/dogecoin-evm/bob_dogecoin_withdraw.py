@@ -5,12 +5,30 @@ import sys
 import os
 import hashlib
 import time
+from dataclasses import dataclass
 
-# Add the dogecoin directory to the path to import HTCL modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../dogecoin'))
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
+
+# Add the dogecoin directory to the path to import HTCL modules; put first so it wins over installed modules
+DOGECOIN_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'dogecoin'))
+if DOGECOIN_DIR not in sys.path:
+    sys.path.insert(0, DOGECOIN_DIR)
 
 from htcl_script import HTCLScriptValidator
-from htcl_transaction import HTCLTransactionBuilder
+
+@dataclass(slots=True, frozen=True)
+class _HTCLScriptView:
+    """HTCL script fields read back from the saved Dogecoin data"""
+    alice_pubkey: str
+    bob_pubkey: str
+    timelock: int
+    hashlock: str
+    p2sh_address: str
+    script_hex: str
+    hashlock_bytes: bytes  # Raw form of hashlock, as read by the validator
 
 def bob_withdraw_on_dogecoin():
     """Bob withdraws from Dogecoin HTCL with the secret before timelock expires"""
@@ -19,8 +37,8 @@ def bob_withdraw_on_dogecoin():
     
     # Load transaction data
     try:
-        with open('dogecoin_htcl_data.json', 'r') as f:
-            dogecoin_data = json.load(f)
+        with open('dogecoin_htcl_data.json', 'rb') as f:
+            dogecoin_data = (orjson or json).loads(f.read())
     except FileNotFoundError:
         print("❌ Error: dogecoin_htcl_data.json not found")
         print("Please run Alice's Dogecoin script first")
@@ -28,8 +46,8 @@ def bob_withdraw_on_dogecoin():
     
     # Load EVM data to check if Alice has withdrawn
     try:
-        with open('evm_htcl_data.json', 'r') as f:
-            evm_data = json.load(f)
+        with open('evm_htcl_data.json', 'rb') as f:
+            evm_data = (orjson or json).loads(f.read())
     except FileNotFoundError:
         print("❌ Error: evm_htcl_data.json not found")
         print("Please run Bob's EVM script first")
@@ -50,19 +68,20 @@ def bob_withdraw_on_dogecoin():
     
     # Validate secret matches hashlock
     print("\n🔍 Validating secret...")
-    secret_bytes = bytes.fromhex(secret[2:] if secret.startswith('0x') else secret)
-    calculated_hashlock = hashlib.sha256(secret_bytes).hexdigest()
+    secret_bytes = bytes.fromhex(secret.removeprefix('0x'))
+    calculated_hashlock = hashlib.sha256(secret_bytes).digest()
     
-    if calculated_hashlock != hashlock:
+    # Compare raw digests; this also accepts a 0x-prefixed stored hashlock
+    if calculated_hashlock != bytes.fromhex(hashlock.removeprefix('0x')):
         print("❌ Error: Secret does not match hashlock")
         print(f"Expected: {hashlock}")
-        print(f"Calculated: {calculated_hashlock}")
+        print(f"Calculated: {calculated_hashlock.hex()}")
         return None
     
     print("✅ Secret validation successful")
     
     # Check if timelock has expired
-    current_time = int(time.time())
+    current_time = time.time_ns() // 10**9
     if current_time >= timelock:
         print("❌ Error: Timelock has expired")
         print(f"Current time: {current_time}")
@@ -79,14 +98,15 @@ def bob_withdraw_on_dogecoin():
     print("✅ Alice has withdrawn from EVM")
     
     # Create HTCL script object for validation
-    script = type('Script', (), {
-        'alice_pubkey': dogecoin_data['alicePubkey'],
-        'bob_pubkey': dogecoin_data['bobPubkey'],
-        'timelock': timelock,
-        'hashlock': hashlock,
-        'p2sh_address': htcl_address,
-        'script_hex': dogecoin_data['scriptHex']
-    })()
+    script = _HTCLScriptView(
+        alice_pubkey=dogecoin_data['alicePubkey'],
+        bob_pubkey=dogecoin_data['bobPubkey'],
+        timelock=timelock,
+        hashlock=hashlock,
+        p2sh_address=htcl_address,
+        script_hex=dogecoin_data['scriptHex'],
+        hashlock_bytes=bytes.fromhex(hashlock.removeprefix('0x'))
+    )
     
     # Mock Bob's signature (in real scenario, you'd create actual signature)
     bob_signature = "bob_signature_123456789abcdef"
@@ -143,8 +163,9 @@ def bob_withdraw_on_dogecoin():
     dogecoin_data['withdrawTxid'] = withdrawal_tx['txid']
     dogecoin_data['withdrawTimestamp'] = current_time
     
-    with open('dogecoin_htcl_data.json', 'w') as f:
-        json.dump(dogecoin_data, f, indent=2)
+    payload = orjson.dumps(dogecoin_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(dogecoin_data, indent=2).encode()
+    with open('dogecoin_htcl_data.json', 'wb') as f:
+        f.write(payload)
     
     print("\n💰 Bob successfully withdrew from Dogecoin HTCL")
     print("📋 Transaction details:")
@@ -166,4 +187,6 @@ def main():
     bob_withdraw_on_dogecoin()
 
 if __name__ == "__main__":
+    # The script prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
     main() 
\ No newline at end of file
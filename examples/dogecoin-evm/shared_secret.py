@@ -1,50 +1,82 @@
 #!/usr/bin/env python3
 
+import functools
 import hashlib
 import secrets
-import binascii
 import hmac
 import time
 import os
-from eth_account import Account
-from hdwallet import HDWallet
-from hdwallet.symbols import ETH
+from typing import Optional, Tuple
 
-def generate_deterministic_secret_from_wallet(mnemonic: str, derivation_path: str = "m/44'/60'/0'/0/0") -> dict:
+# hashlib.sha256 is OpenSSL's constructor; bind it once for the hashing call sites
+_sha256 = hashlib.sha256
+
+@functools.lru_cache(maxsize=64)
+def _derive(mnemonic: str, derivation_path: str) -> Tuple[str, str]:
+    """
+    Derive the wallet private key and address; cached because BIP44 seed derivation is expensive
+    Args:
+        mnemonic: Wallet mnemonic phrase
+        derivation_path: HD wallet derivation path
+    Returns: Tuple of (private key, address)
+    """
+    # Imported here so callers that never derive keys skip loading hdwallet
+    from hdwallet import HDWallet
+    from hdwallet.symbols import ETH
+    
+    hdwallet = HDWallet(symbol=ETH)
+    hdwallet.from_mnemonic(mnemonic)
+    hdwallet.from_path(derivation_path)
+    return hdwallet.private_key(), hdwallet.address()
+
+@functools.lru_cache(maxsize=64)
+def _hmac_template(private_key: str):
+    """HMAC-SHA256 keyed with the private key; copied per message so the key schedule runs once"""
+    return hmac.new(private_key.encode(), digestmod='sha256')
+
+def _secret_mac(private_key: str, message: str) -> bytes:
+    """HMAC-SHA256 of the message under the private key, reusing the cached keyed state"""
+    mac = _hmac_template(private_key).copy()
+    mac.update(message.encode())
+    return mac.digest()
+
+@functools.lru_cache(maxsize=64)
+def _address_from_private_key(private_key: str) -> str:
+    """Derive the account address for a private key; cached to skip the secp256k1 work"""
+    from eth_account import Account
+    return Account.from_key(private_key).address
+
+def generate_deterministic_secret_from_wallet(mnemonic: str, derivation_path: str = "m/44'/60'/0'/0/0", now: Optional[int] = None) -> dict:
     """
     Generate a deterministic secret from wallet mnemonic using HMAC-SHA256
     This ensures the same wallet generates the same secret across all chains
+    Args:
+        now: Current Unix time in seconds; read from the clock when None
     """
     try:
-        # Initialize HD wallet
-        hdwallet = HDWallet(symbol=ETH)
-        hdwallet.from_mnemonic(mnemonic)
-        hdwallet.from_path(derivation_path)
-        
-        private_key = hdwallet.private_key()
-        address = hdwallet.address()
+        # Get private key and address from the HD wallet
+        private_key, address = _derive(mnemonic, derivation_path)
         
         # Create a deterministic secret using private key + timestamp
         # This ensures the same wallet generates the same secret for the same timestamp
-        timestamp = int(time.time() / 3600) * 3600  # Round to hour for consistency
+        if now is None:
+            now = time.time_ns() // 10**9
+        timestamp = now // 3600 * 3600  # Round to hour for consistency
         message = f"HTCL_CROSS_CHAIN_SECRET_{timestamp}"
         
         # Use HMAC-SHA256 with private key as key and message as data
         # This creates a deterministic secret that's the same across all chains
-        secret_bytes = hmac.new(
-            private_key.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).digest()
+        secret_bytes = _secret_mac(private_key, message)
         
         secret_hex = '0x' + secret_bytes.hex()
-        hashlock = hashlib.sha256(secret_bytes).hexdigest()
-        hashlock_hex = '0x' + hashlock
+        hashlock_bytes = _sha256(secret_bytes).digest()
+        hashlock_hex = '0x' + hashlock_bytes.hex()
         
         return {
             'secret': secret_hex,
             'secret_bytes': secret_bytes,
             'hashlock': hashlock_hex,  # Universal hashlock (0x format)
+            'hashlock_bytes': hashlock_bytes,
             'wallet_address': address,
             'message': message,
             'timestamp': timestamp,
@@ -53,35 +85,35 @@ def generate_deterministic_secret_from_wallet(mnemonic: str, derivation_path: st
     except Exception as e:
         raise Exception(f"Deterministic secret generation failed: {str(e)}")
 
-def generate_deterministic_secret_from_private_key(private_key: str) -> dict:
+def generate_deterministic_secret_from_private_key(private_key: str, now: Optional[int] = None) -> dict:
     """
     Generate a deterministic secret from private key using HMAC-SHA256
     This ensures the same private key generates the same secret across all chains
+    Args:
+        now: Current Unix time in seconds; read from the clock when None
     """
     try:
         # Initialize account from private key
-        account = Account.from_key(private_key)
-        address = account.address
+        address = _address_from_private_key(private_key)
         
         # Create a deterministic secret using private key + timestamp
-        timestamp = int(time.time() / 3600) * 3600  # Round to hour for consistency
+        if now is None:
+            now = time.time_ns() // 10**9
+        timestamp = now // 3600 * 3600  # Round to hour for consistency
         message = f"HTCL_CROSS_CHAIN_SECRET_{timestamp}"
         
         # Use HMAC-SHA256 with private key as key and message as data
-        secret_bytes = hmac.new(
-            private_key.encode(),
-            message.encode(),
-            hashlib.sha256
-        ).digest()
+        secret_bytes = _secret_mac(private_key, message)
         
         secret_hex = '0x' + secret_bytes.hex()
-        hashlock = hashlib.sha256(secret_bytes).hexdigest()
-        hashlock_hex = '0x' + hashlock
+        hashlock_bytes = _sha256(secret_bytes).digest()
+        hashlock_hex = '0x' + hashlock_bytes.hex()
         
         return {
             'secret': secret_hex,
             'secret_bytes': secret_bytes,
             'hashlock': hashlock_hex,  # Universal hashlock (0x format)
+            'hashlock_bytes': hashlock_bytes,
             'wallet_address': address,
             'message': message,
             'timestamp': timestamp,
@@ -90,6 +122,35 @@ def generate_deterministic_secret_from_private_key(private_key: str) -> dict:
     except Exception as e:
         raise Exception(f"Deterministic secret generation failed: {str(e)}")
 
+def generate_deterministic_secret_batch(private_keys, timestamps) -> list:
+    """
+    Generate deterministic secrets for many (private key, timestamp) pairs at once
+    The wallet address is not derived; use generate_deterministic_secret_from_private_key for that
+    Args:
+        private_keys: Wallet private keys, keyed the same way as the single-key generator
+        timestamps: Unix times in seconds, one per private key
+    Returns: List of objects containing secret and hashlock
+    """
+    # Each private key's HMAC is keyed once and copied for every message
+    sha256 = _sha256
+    results = []
+    for private_key, now in zip(private_keys, timestamps):
+        timestamp = now // 3600 * 3600  # Round to hour for consistency
+        message = f"HTCL_CROSS_CHAIN_SECRET_{timestamp}"
+        secret_bytes = _secret_mac(private_key, message)
+        hashlock_bytes = sha256(secret_bytes).digest()
+        
+        results.append({
+            'secret': '0x' + secret_bytes.hex(),
+            'secret_bytes': secret_bytes,
+            'hashlock': '0x' + hashlock_bytes.hex(),  # Universal hashlock (0x format)
+            'hashlock_bytes': hashlock_bytes,
+            'message': message,
+            'timestamp': timestamp,
+            'method': 'deterministic_hmac'
+        })
+    return results
+
 def generate_secret_and_hashlock():
     """
     Generate a random secret and its corresponding hashlock (FALLBACK METHOD)
@@ -100,13 +161,14 @@ def generate_secret_and_hashlock():
     secret_hex = '0x' + secret_bytes.hex()
     
     # Create hashlock (sha256 hash of the secret)
-    hashlock = hashlib.sha256(secret_bytes).hexdigest()
-    hashlock_hex = '0x' + hashlock
+    hashlock_bytes = _sha256(secret_bytes).digest()
+    hashlock_hex = '0x' + hashlock_bytes.hex()
     
     return {
         'secret': secret_hex,
         'secret_bytes': secret_bytes,
         'hashlock': hashlock_hex,  # Universal hashlock (0x format)
+        'hashlock_bytes': hashlock_bytes,
         'method': 'random'
     }
 
@@ -119,32 +181,59 @@ def validate_secret(secret, hashlock):
     Returns: True if secret matches hashlock
     """
     # Remove 0x prefix if present
-    clean_secret = secret[2:] if secret.startswith('0x') else secret
-    secret_bytes = binascii.unhexlify(clean_secret)
+    secret_bytes = bytes.fromhex(secret.removeprefix('0x'))
     
-    # Create hashlock from secret
-    calculated_hashlock = hashlib.sha256(secret_bytes).hexdigest()
-    expected_hashlock = hashlock[2:] if hashlock.startswith('0x') else hashlock
+    # Compare raw digests rather than hex strings
+    expected_hashlock = bytes.fromhex(hashlock.removeprefix('0x'))
     
-    return calculated_hashlock == expected_hashlock
+    return _sha256(secret_bytes).digest() == expected_hashlock
+
+def validate_secrets(secrets, hashlocks):
+    """
+    Validate many secrets against their hashlocks at once
+    Args:
+        secrets: The secrets to validate
+        hashlocks: The hashlocks to check against, in the same order
+    Returns: List with True for each secret that matches its hashlock
+    """
+    # Keep the hash constructor and decoder in locals so the loop avoids global lookups
+    sha256, fromhex = _sha256, bytes.fromhex
+    return [
+        sha256(fromhex(secret.removeprefix('0x'))).digest()
+        == fromhex(hashlock.removeprefix('0x'))
+        for secret, hashlock in zip(secrets, hashlocks)
+    ]
 
 def dogecoin_to_evm_hashlock(dogecoin_hashlock):
     """
     Convert Dogecoin hashlock format to EVM format
     Args:
-        dogecoin_hashlock: Hashlock in Dogecoin format (hex string)
+        dogecoin_hashlock: Hashlock in Dogecoin format (hex string) or raw bytes
     Returns: Hashlock in EVM format (0x...)
     """
-    return dogecoin_hashlock if dogecoin_hashlock.startswith('0x') else '0x' + dogecoin_hashlock
+    if isinstance(dogecoin_hashlock, (bytes, bytearray)):
+        return '0x' + dogecoin_hashlock.hex()
+    return '0x' + dogecoin_hashlock.removeprefix('0x')
 
 def evm_to_dogecoin_hashlock(evm_hashlock):
     """
     Convert EVM hashlock format to Dogecoin format
     Args:
-        evm_hashlock: Hashlock in EVM format (0x...)
+        evm_hashlock: Hashlock in EVM format (0x...) or raw bytes
     Returns: Hashlock in Dogecoin format (hex string without 0x)
     """
-    return evm_hashlock[2:] if evm_hashlock.startswith('0x') else evm_hashlock
+    if isinstance(evm_hashlock, (bytes, bytearray)):
+        return evm_hashlock.hex()
+    return evm_hashlock.removeprefix('0x')
+
+def normalize_hashlocks(hashlocks):
+    """
+    Convert many hashlocks to Dogecoin format at once
+    Args:
+        hashlocks: Hashlocks in EVM or Dogecoin format
+    Returns: List of hashlocks in Dogecoin format (hex string without 0x)
+    """
+    return [hashlock.removeprefix('0x') for hashlock in hashlocks]
 
 if __name__ == "__main__":
     print("=== Cross-Chain Compatible Secret Generation ===")
@@ -208,5 +297,5 @@ if __name__ == "__main__":
     print("Secret validation:", is_valid)
     
     print("\nFormat conversion:")
-    print("Dogecoin to EVM:", dogecoin_to_evm_hashlock(result['hashlock'][2:]))
-    print("EVM to Dogecoin:", evm_to_dogecoin_hashlock(result['hashlock'])) 
\ No newline at end of file
+    print("Dogecoin to EVM:", dogecoin_to_evm_hashlock(result['hashlock_bytes']))
+    print("EVM to Dogecoin:", evm_to_dogecoin_hashlock(result['hashlock_bytes'])) 
\ No newline at end of file
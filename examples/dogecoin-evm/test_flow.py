@@ -11,9 +11,14 @@ import sys
 import time
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
+
 # Add the shared_secret module to path
 sys.path.append(str(Path(__file__).parent))
-from shared_secret import generate_deterministic_secret_from_wallet
+from shared_secret import generate_deterministic_secret_from_wallet, evm_to_dogecoin_hashlock
 
 def test_dogecoin_evm_flow():
     """Test the complete Dogecoin-EVM cross-chain HTCL flow"""
@@ -38,10 +43,12 @@ def test_dogecoin_evm_flow():
         
         # Use a mock mnemonic for testing
         mnemonic = "test test test test test test test test test test test junk"
-        result = generate_deterministic_secret_from_wallet(mnemonic)
+        now = time.time_ns() // 10**9  # Read the clock once for the secret and the timelock
+        result = generate_deterministic_secret_from_wallet(mnemonic, now=now)
         
         secret = result['secret']
         hashlock = result['hashlock']
+        hashlock_bytes = result['hashlock_bytes']
         wallet_address = result['wallet_address']
         message = result['message']
         timestamp = result['timestamp']
@@ -61,7 +68,7 @@ def test_dogecoin_evm_flow():
             "creator": alice_dogecoin_address,
             "recipient": bob_dogecoin_address,
             "timelock": timelock,
-            "hashlock": hashlock[2:],  # Remove 0x prefix for Dogecoin
+            "hashlock": evm_to_dogecoin_hashlock(hashlock_bytes),  # No 0x prefix for Dogecoin
             "amount": "1000000",  # 1 DOGE in satoshis
             "secret": secret,
             "destinyNetwork": "polygon-amoy",
@@ -84,7 +91,7 @@ def test_dogecoin_evm_flow():
             "htclAddress": "0xHTCLContract123456789012345678901234567890",
             "creator": bob_evm_address,
             "recipient": alice_evm_address,
-            "timelock": int(time.time()) + 3600,  # 1 hour from now
+            "timelock": now + 3600,  # 1 hour from now
             "hashlock": hashlock,  # Keep 0x prefix for EVM
             "amount": "1000000000000000000",  # 1 ETH in wei
             "secret": secret,
@@ -115,8 +122,9 @@ def test_dogecoin_evm_flow():
         }
         
         data_path = Path(__file__).parent / "transaction_data.json"
-        with open(data_path, 'w') as f:
-            json.dump(transaction_data, f, indent=2)
+        payload = orjson.dumps(transaction_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(transaction_data, indent=2).encode()
+        with open(data_path, 'wb') as f:
+            f.write(payload)
         
         print(f"💾 Transaction data saved to: {data_path}")
         
@@ -146,4 +154,6 @@ def test_dogecoin_evm_flow():
         sys.exit(1)
 
 if __name__ == "__main__":
+    # The test prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
     test_dogecoin_evm_flow() 
\ No newline at end of file
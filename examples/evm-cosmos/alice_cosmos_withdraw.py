@@ -1,20 +1,24 @@
 #!/usr/bin/env python3
 
 import json
-import asyncio
+import sys
 import hashlib
-from cosmjs import CosmWasmClient, SigningCosmWasmClient
-from cosmjs.types import Coin
+import time
 
-async def alice_withdraw_on_cosmos():
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
+
+def alice_withdraw_on_cosmos():
     """Alice withdraws from Cosmos HTCL with the secret before timelock expires"""
     
     print("🚀 Alice withdrawing from Cosmos HTCL...")
     
     # Load transaction data
     try:
-        with open('cosmos_htcl_data.json', 'r') as f:
-            cosmos_data = json.load(f)
+        with open('cosmos_htcl_data.json', 'rb') as f:
+            cosmos_data = (orjson or json).loads(f.read())
     except FileNotFoundError:
         print("❌ Error: cosmos_htcl_data.json not found")
         print("Please run Bob's Cosmos script first")
@@ -35,19 +39,20 @@ async def alice_withdraw_on_cosmos():
     
     # Validate secret matches hashlock
     print("\n🔍 Validating secret...")
-    secret_bytes = bytes.fromhex(secret[2:] if secret.startswith('0x') else secret)
-    calculated_hashlock = hashlib.sha256(secret_bytes).hexdigest()
+    secret_bytes = bytes.fromhex(secret.removeprefix('0x'))
+    calculated_hashlock = hashlib.sha256(secret_bytes).digest()
     
-    if calculated_hashlock != hashlock:
+    # Compare raw digests; this also accepts a 0x-prefixed stored hashlock
+    if calculated_hashlock != bytes.fromhex(hashlock.removeprefix('0x')):
         print("❌ Error: Secret does not match hashlock")
         print(f"Expected: {hashlock}")
-        print(f"Calculated: {calculated_hashlock}")
+        print(f"Calculated: {calculated_hashlock.hex()}")
         return None
     
     print("✅ Secret validation successful")
     
     # Check if timelock has expired
-    current_time = int(asyncio.get_event_loop().time())
+    current_time = time.time_ns() // 10**9
     if current_time >= timelock:
         print("❌ Error: Timelock has expired")
         print(f"Current time: {current_time}")
@@ -79,8 +84,9 @@ async def alice_withdraw_on_cosmos():
     cosmos_data['withdrawTxHash'] = tx_hash
     cosmos_data['withdrawTimestamp'] = current_time
     
-    with open('cosmos_htcl_data.json', 'w') as f:
-        json.dump(cosmos_data, f, indent=2)
+    payload = orjson.dumps(cosmos_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(cosmos_data, indent=2).encode()
+    with open('cosmos_htcl_data.json', 'wb') as f:
+        f.write(payload)
     
     print("\n💰 Alice successfully withdrew from Cosmos HTCL")
     print("📋 Transaction details:")
@@ -94,8 +100,10 @@ async def alice_withdraw_on_cosmos():
     
     return cosmos_data
 
-async def main():
-    await alice_withdraw_on_cosmos()
+def main():
+    alice_withdraw_on_cosmos()
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # The script prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
+    main() 
\ No newline at end of file
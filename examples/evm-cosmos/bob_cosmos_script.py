@@ -1,13 +1,16 @@
 #!/usr/bin/env python3
 
 import json
-import asyncio
+import sys
 from datetime import datetime, timedelta
 from cosmwasm_schema import cw_serde
-from cosmjs import CosmWasmClient, SigningCosmWasmClient
-from cosmjs.types import Coin
 import hashlib
 
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
+
 # Mock HTCL contract interface for Cosmos
 @cw_serde
 class InstantiateMsg:
@@ -20,15 +23,15 @@ class ExecuteMsg:
     bob_withdraw: dict = None
     alice_withdraw: dict = None
 
-async def create_htcl_on_cosmos():
+def create_htcl_on_cosmos():
     """Bob creates HTCL on Cosmos with the same hashlock as Alice's EVM HTCL"""
     
     print("🚀 Bob creating HTCL on Cosmos...")
     
     # Load transaction data from Alice's EVM HTCL
     try:
-        with open('evm_htcl_data.json', 'r') as f:
-            evm_data = json.load(f)
+        with open('evm_htcl_data.json', 'rb') as f:
+            evm_data = (orjson or json).loads(f.read())
     except FileNotFoundError:
         print("❌ Error: evm_htcl_data.json not found")
         print("Please run Alice's EVM script first")
@@ -40,6 +43,13 @@ async def create_htcl_on_cosmos():
     alice_address = evm_data['aliceAddress']
     bob_address = evm_data['bobAddress']
     amount = evm_data['amount']
+    secret = evm_data['secret']
+    evm_htcl_address = evm_data['htclAddress']
+    
+    # Validate hashlock format before doing anything with it
+    if not hashlock_cosmos or len(hashlock_cosmos) != 64:
+        print("❌ Error: Invalid hashlock format")
+        return None
     
     print(f"Hashlock (Cosmos): {hashlock_cosmos}")
     print(f"Timelock: {timelock}")
@@ -47,11 +57,6 @@ async def create_htcl_on_cosmos():
     print(f"Bob address: {bob_address}")
     print(f"Amount: {amount}")
     
-    # Validate hashlock format
-    if not hashlock_cosmos or len(hashlock_cosmos) != 64:
-        print("❌ Error: Invalid hashlock format")
-        return None
-    
     # Create instantiate message for Cosmos HTCL
     instantiate_msg = InstantiateMsg(
         bob=alice_address,  # Alice is the recipient on Cosmos
@@ -78,22 +83,23 @@ async def create_htcl_on_cosmos():
         "timelock": timelock,
         "hashlock": hashlock_cosmos,
         "amount": amount,
-        "secret": evm_data['secret'],  # Keep secret for later use
-        "evmHtclAddress": evm_data['htclAddress']
+        "secret": secret,  # Keep secret for later use
+        "evmHtclAddress": evm_htcl_address
     }
     
-    with open('cosmos_htcl_data.json', 'w') as f:
-        json.dump(cosmos_data, f, indent=2)
+    payload = orjson.dumps(cosmos_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(cosmos_data, indent=2).encode()
+    with open('cosmos_htcl_data.json', 'wb') as f:
+        f.write(payload)
     
     print("📄 Cosmos HTCL data saved to cosmos_htcl_data.json")
     
     # Verify the setup
     print("\n🔍 Verification:")
-    print(f"EVM HTCL: {evm_data['htclAddress']}")
+    print(f"EVM HTCL: {evm_htcl_address}")
     print(f"Cosmos HTCL: {htcl_address}")
     print(f"Shared hashlock: {hashlock_cosmos}")
     print(f"Shared timelock: {timelock}")
-    print(f"Secret: {evm_data['secret']}")
+    print(f"Secret: {secret}")
     
     print("\n✅ Bob successfully created HTCL on Cosmos")
     print("📋 Next steps:")
@@ -102,8 +108,10 @@ async def create_htcl_on_cosmos():
     
     return cosmos_data
 
-async def main():
-    await create_htcl_on_cosmos()
+def main():
+    create_htcl_on_cosmos()
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    # The script prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
+    main() 
\ No newline at end of file
@@ -5,22 +5,30 @@ import sys
 import os
 import hashlib
 import time
+from types import SimpleNamespace
 
-# Add the dogecoin directory to the path to import HTCL modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../dogecoin'))
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
 
-from htcl_script import HTCLScriptValidator, generate_hashlock
-from htcl_transaction import HTCLTransactionBuilder, HTCLTransactionValidator
+# Add the dogecoin directory to the path to import HTCL modules; put first so it wins over installed modules
+DOGECOIN_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'dogecoin'))
+if DOGECOIN_DIR not in sys.path:
+    sys.path.insert(0, DOGECOIN_DIR)
 
 def alice_withdraw_on_dogecoin():
     """Alice withdraws from Dogecoin HTCL with the secret before timelock expires"""
     
+    # Imported here so importing this module does not load the HTCL modules
+    from htcl_script import HTCLScriptValidator
+    
     print("🚀 Alice withdrawing from Dogecoin HTCL...")
     
     # Load transaction data
     try:
-        with open('dogecoin_htcl_data.json', 'r') as f:
-            dogecoin_data = json.load(f)
+        with open('dogecoin_htcl_data.json', 'rb') as f:
+            dogecoin_data = (orjson or json).loads(f.read())
     except FileNotFoundError:
         print("❌ Error: dogecoin_htcl_data.json not found")
         print("Please run Bob's Dogecoin script first")
@@ -41,19 +49,20 @@ def alice_withdraw_on_dogecoin():
     
     # Validate secret matches hashlock
     print("\n🔍 Validating secret...")
-    secret_bytes = bytes.fromhex(secret[2:] if secret.startswith('0x') else secret)
-    calculated_hashlock = hashlib.sha256(secret_bytes).hexdigest()
+    expected_hashlock = bytes.fromhex(hashlock.removeprefix('0x'))
+    calculated_hashlock = hashlib.sha256(bytes.fromhex(secret.removeprefix('0x'))).digest()
     
-    if calculated_hashlock != hashlock:
+    # Compare raw digests; this also accepts a 0x-prefixed stored hashlock
+    if calculated_hashlock != expected_hashlock:
         print("❌ Error: Secret does not match hashlock")
         print(f"Expected: {hashlock}")
-        print(f"Calculated: {calculated_hashlock}")
+        print(f"Calculated: {calculated_hashlock.hex()}")
         return None
     
     print("✅ Secret validation successful")
     
     # Check if timelock has expired
-    current_time = int(time.time())
+    current_time = time.time_ns() // 10**9
     if current_time >= timelock:
         print("❌ Error: Timelock has expired")
         print(f"Current time: {current_time}")
@@ -62,15 +71,16 @@ def alice_withdraw_on_dogecoin():
     
     print("✅ Timelock check passed")
     
-    # Create HTCL script object for validation
-    script = type('Script', (), {
-        'alice_pubkey': dogecoin_data['alicePubkey'],
-        'bob_pubkey': dogecoin_data['bobPubkey'],
-        'timelock': timelock,
-        'hashlock': hashlock,
-        'p2sh_address': htcl_address,
-        'script_hex': dogecoin_data['scriptHex']
-    })()
+    # Create HTCL script object for validation; hashlock_bytes is the raw hashlock the validator reads
+    script = SimpleNamespace(
+        alice_pubkey=dogecoin_data['alicePubkey'],
+        bob_pubkey=dogecoin_data['bobPubkey'],
+        timelock=timelock,
+        hashlock=hashlock,
+        p2sh_address=htcl_address,
+        script_hex=dogecoin_data['scriptHex'],
+        hashlock_bytes=expected_hashlock
+    )
     
     # Mock Alice's signature (in real scenario, you'd create actual signature)
     alice_signature = "alice_signature_123456789abcdef"
@@ -127,8 +137,12 @@ def alice_withdraw_on_dogecoin():
     dogecoin_data['withdrawTxid'] = withdrawal_tx['txid']
     dogecoin_data['withdrawTimestamp'] = current_time
     
-    with open('dogecoin_htcl_data.json', 'w') as f:
-        json.dump(dogecoin_data, f, indent=2)
+    payload = orjson.dumps(dogecoin_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(dogecoin_data, indent=2).encode()
+    # Write the whole payload to a temp file and swap it in, so a crash never leaves a partial file
+    with open('dogecoin_htcl_data.json.tmp', 'wb', buffering=0) as f:
+        f.write(payload)
+        os.fsync(f.fileno())
+    os.replace('dogecoin_htcl_data.json.tmp', 'dogecoin_htcl_data.json')
     
     print("\n💰 Alice successfully withdrew from Dogecoin HTCL")
     print("📋 Transaction details:")
@@ -146,4 +160,6 @@ def main():
     alice_withdraw_on_dogecoin()
 
 if __name__ == "__main__":
+    # The script prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
     main() 
\ No newline at end of file
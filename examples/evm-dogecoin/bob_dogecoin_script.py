@@ -6,21 +6,37 @@ import os
 import hashlib
 import time
 
-# Add the dogecoin directory to the path to import HTCL modules
-sys.path.append(os.path.join(os.path.dirname(__file__), '../../dogecoin'))
+try:
+    import orjson
+except ImportError:  # Fall back to the standard library
+    orjson = None
 
-from htcl_script import HTCLScriptGenerator, generate_hashlock
-from htcl_transaction import HTCLTransactionBuilder, get_current_block_height
+# Add the dogecoin directory to the path to import HTCL modules; put first so it wins over installed modules
+DOGECOIN_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', 'dogecoin'))
+if DOGECOIN_DIR not in sys.path:
+    sys.path.insert(0, DOGECOIN_DIR)
+
+# Alice and Bob public keys; mock values (in real scenario, these would be actual keys)
+ALICE_PUBKEY = "02" + "a" * 64
+BOB_PUBKEY = "02" + "b" * 64
+
+# Mock input UTXO and funding transaction ids
+INPUT_TXID = '1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef'
+FUNDING_TXID = 'fedcba0987654321fedcba0987654321fedcba0987654321fedcba0987654321'
 
 def create_htcl_on_dogecoin():
     """Bob creates HTCL on Dogecoin with the same hashlock as Alice's EVM HTCL"""
     
+    # Imported here so importing this module does not load the HTCL modules
+    from htcl_script import HTCLScriptGenerator
+    from htcl_transaction import HTCLTransactionBuilder, get_current_block_height
+    
     print("🚀 Bob creating HTCL on Dogecoin...")
     
     # Load transaction data from Alice's EVM HTCL
     try:
-        with open('evm_htcl_data.json', 'r') as f:
-            evm_data = json.load(f)
+        with open('evm_htcl_data.json', 'rb') as f:
+            evm_data = (orjson or json).loads(f.read())
     except FileNotFoundError:
         print("❌ Error: evm_htcl_data.json not found")
         print("Please run Alice's EVM script first")
@@ -32,6 +48,8 @@ def create_htcl_on_dogecoin():
     alice_address = evm_data['aliceAddress']
     bob_address = evm_data['bobAddress']
     amount = evm_data['amount']
+    secret = evm_data['secret']
+    evm_htcl_address = evm_data['htclAddress']
     
     print(f"Hashlock (Dogecoin): {hashlock_dogecoin}")
     print(f"Timelock: {timelock}")
@@ -39,14 +57,17 @@ def create_htcl_on_dogecoin():
     print(f"Bob address: {bob_address}")
     print(f"Amount: {amount}")
     
-    # Validate hashlock format
-    if not hashlock_dogecoin or len(hashlock_dogecoin) != 64:
+    # Validate hashlock format; decoding also rejects non-hex characters
+    try:
+        hashlock_bytes = bytes.fromhex(hashlock_dogecoin)
+    except (TypeError, ValueError):
+        hashlock_bytes = b''
+    if len(hashlock_bytes) != 32:
         print("❌ Error: Invalid hashlock format")
         return None
     
-    # Mock Alice and Bob public keys (in real scenario, these would be actual keys)
-    alice_pubkey = "02" + "a" * 64  # Alice's public key
-    bob_pubkey = "02" + "b" * 64    # Bob's public key
+    alice_pubkey = ALICE_PUBKEY
+    bob_pubkey = BOB_PUBKEY
     
     # Convert timelock to block height (approximate)
     # In practice, you'd need to convert timestamp to block height
@@ -64,12 +85,14 @@ def create_htcl_on_dogecoin():
         timelock=timelock_block,
         hashlock=hashlock_dogecoin  # Universal hashlock that works across all chains
     )
+    p2sh_address = script.p2sh_address
+    script_hex = script.script_hex
     
     print(f"Alice pubkey: {script.alice_pubkey[:16]}...")
     print(f"Bob pubkey: {script.bob_pubkey[:16]}...")
     print(f"Hashlock: {script.hashlock}")
-    print(f"P2SH Address: {script.p2sh_address}")
-    print(f"Script Hex: {script.script_hex[:50]}...")
+    print(f"P2SH Address: {p2sh_address}")
+    print(f"Script Hex: {script_hex[:50]}...")
     
     # Validate the script
     if HTCLScriptGenerator.validate_script(script):
@@ -87,7 +110,7 @@ def create_htcl_on_dogecoin():
     # Example input UTXOs (in practice, you'd get these from a wallet)
     input_utxos = [
         {
-            'txid': '1234567890abcdef1234567890abcdef1234567890abcdef1234567890abcdef',
+            'txid': INPUT_TXID,
             'vout': 0,
             'amount': 1000000  # 1 DOGE in satoshis
         }
@@ -99,46 +122,50 @@ def create_htcl_on_dogecoin():
     
     # Mock funding transaction creation
     funding_tx = {
-        'txid': 'fedcba0987654321fedcba0987654321fedcba0987654321fedcba0987654321',
-        'script_address': script.p2sh_address,
+        'txid': FUNDING_TXID,
+        'script_address': p2sh_address,
         'amount': funding_amount,
         'fee': fee
     }
     
     print(f"Funding transaction created:")
-    print(f"  TXID: {funding_tx['txid']}")
-    print(f"  Script Address: {funding_tx['script_address']}")
-    print(f"  Amount: {funding_tx['amount']} satoshis")
-    print(f"  Fee: {funding_tx['fee']} satoshis")
+    print(f"  TXID: {FUNDING_TXID}")
+    print(f"  Script Address: {p2sh_address}")
+    print(f"  Amount: {funding_amount} satoshis")
+    print(f"  Fee: {fee} satoshis")
     
     # Save Dogecoin HTCL data
     dogecoin_data = {
-        "htclAddress": script.p2sh_address,
-        "scriptHex": script.script_hex,
+        "htclAddress": p2sh_address,
+        "scriptHex": script_hex,
         "creator": bob_address,
         "recipient": alice_address,
         "timelock": timelock_block,
         "hashlock": hashlock_dogecoin,
         "amount": funding_amount,
-        "secret": evm_data['secret'],  # Keep secret for later use
-        "evmHtclAddress": evm_data['htclAddress'],
-        "fundingTxid": funding_tx['txid'],
+        "secret": secret,  # Keep secret for later use
+        "evmHtclAddress": evm_htcl_address,
+        "fundingTxid": FUNDING_TXID,
         "alicePubkey": alice_pubkey,
         "bobPubkey": bob_pubkey
     }
     
-    with open('dogecoin_htcl_data.json', 'w') as f:
-        json.dump(dogecoin_data, f, indent=2)
+    payload = orjson.dumps(dogecoin_data, option=orjson.OPT_INDENT_2) if orjson else json.dumps(dogecoin_data, indent=2).encode()
+    # Write the whole payload to a temp file and swap it in, so a crash never leaves a partial file
+    with open('dogecoin_htcl_data.json.tmp', 'wb', buffering=0) as f:
+        f.write(payload)
+        os.fsync(f.fileno())
+    os.replace('dogecoin_htcl_data.json.tmp', 'dogecoin_htcl_data.json')
     
     print("📄 Dogecoin HTCL data saved to dogecoin_htcl_data.json")
     
     # Verify the setup
     print("\n🔍 Verification:")
-    print(f"EVM HTCL: {evm_data['htclAddress']}")
-    print(f"Dogecoin HTCL: {script.p2sh_address}")
+    print(f"EVM HTCL: {evm_htcl_address}")
+    print(f"Dogecoin HTCL: {p2sh_address}")
     print(f"Shared hashlock: {hashlock_dogecoin}")
     print(f"Shared timelock: {timelock}")
-    print(f"Secret: {evm_data['secret']}")
+    print(f"Secret: {secret}")
     
     print("\n✅ Bob successfully created HTCL on Dogecoin")
     print("📋 Next steps:")
@@ -151,4 +178,6 @@ def main():
     create_htcl_on_dogecoin()
 
 if __name__ == "__main__":
+    # The script prints many short lines; buffer them instead of flushing per line
+    sys.stdout.reconfigure(line_buffering=False)
     main() 
\ No newline at end of file